@@ -1,4 +1,5 @@
 import pygame, time
+from resources.textcache import text_cache
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -38,7 +39,7 @@ class ImageSettingsScreen:
         self.background.draw(self.screen, 0)
         # Draw title
         title_text = "Image Settings"
-        title_surface = self.title_font.render(title_text, True, BLACK)
+        title_surface = text_cache.render(self.title_font, title_text, BLACK)
         title_width = title_surface.get_width()
         title_height = title_surface.get_height()
         
@@ -71,7 +72,7 @@ class ImageSettingsScreen:
             else:
                 setting_text = setting
             
-            text_surface = self.font.render(setting_text, True, BLACK)
+            text_surface = text_cache.render(self.font, setting_text, BLACK)
             text_width = text_surface.get_width()
             text_height = text_surface.get_height()
             
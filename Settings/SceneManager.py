@@ -1,5 +1,11 @@
 import pygame
-from levels import Level1, Level2, Level3
+from levels.registry import levels as level_registry
+from resources.tools import frame_cache
+from resources.profiler import profiler
+from resources.overlays import overlays
+from resources.sceneloader import SceneLoader
+from resources.levelpool import LevelPool
+from resources.startup import startup
 
 class ScreenManager:
     def __init__(self, initial_screen):
@@ -21,15 +27,110 @@ class SceneManager:
         self.current_level = ""
         self.clock = clock
         self.settings_object = settings_object
+        self.presented_scene = None  # Scene whose frame is on the display, for dirty-rect rendering
+        self.loader = SceneLoader()  # Builds the next level while the transition plays
+        self.levels = LevelPool()  # Loaded levels, replays only soft reset them
+        self.factories = {}  # Scenes not built yet: name -> factory(settings_object, screen)
+        self.prewarm_queue = []  # Factories to build during idle frames
+        self.prewarm_delay = 0  # Frames to wait before pre-warming
+        self.prewarmer = SceneLoader()  # Builds the pre-warmed scene a little every idle frame
 
     def add_scene(self, name, scene):
-        """Add a new scene to the scene manager."""
-        self.scenes[name] = scene
-    def purge_scene(self, name):
-        self.scenes.pop(name)
+        """
+        Add a new scene to the scene manager.
+
+        scene is either a built scene or a factory, e.g. the scene's class,
+        called with (settings_object, screen) the first time the scene is
+        changed to or pre-warmed.
+        """
+        if isinstance(scene, type) or (callable(scene) and not hasattr(scene, "handle_events")):
+            self.factories[name] = scene
+            self.scenes.pop(name, None)
+        else:
+            self.scenes[name] = scene
+            self.factories.pop(name, None)
+
+    def build_scene(self, name):
+        """Build a scene added as a factory, returns False when there is none."""
+        factory = self.factories.pop(name, None)
+        if factory is None:
+            return False
+        with startup.span("scene", name), profiler.scope("scene.build"):
+            if self.prewarmer.loading and self.prewarmer.name == name:
+                # Pre-warming got part of the way, build the rest now
+                self.scenes[name] = self.prewarmer.finish()
+            else:
+                self.scenes[name] = factory(self.settings_object, self.screen)
+        return True
+
+    def prewarm(self, *names, delay=30):
+        """
+        Build factory scenes during idle frames.
+
+        Only factories with a loader (see LevelChooserScreen.loader) are
+        pre-warmed: starting delay frames after the call, the loader runs
+        within the SceneLoader's per-frame budget on frames where the
+        previous frame left at least half its time budget. Other factories
+        are built when they are first changed to.
+        """
+        self.prewarm_queue.extend(names)
+        self.prewarm_delay = delay
+
+    def _prewarm_step(self):
+        if self.prewarm_delay > 0:
+            self.prewarm_delay -= 1
+            return
+        frame_budget = 1000 / max(self.settings_object.fps, 1)
+        if self.clock.get_rawtime() > frame_budget / 2:
+            return
+        if not self.prewarmer.loading:
+            name = self.prewarm_queue[0]
+            factory = self.factories.get(name)
+            if not hasattr(factory, "loader"):
+                # Built already, or only buildable in one go
+                self.prewarm_queue.pop(0)
+                return
+            self.prewarmer.start(name, factory.loader(self.settings_object, self.screen))
+        with profiler.scope("scene.prewarm"):
+            if self.prewarmer.step():
+                self.prewarm_queue.pop(0)
+                if self.factories.pop(self.prewarmer.name, None) is not None:
+                    self.scenes[self.prewarmer.name] = self.prewarmer.scene
+
+    def load_scene(self, name, loader):
+        """
+        Start building a scene in the background of the next transition.
+
+        The loader runs within the loader's per-frame budget during update();
+        the white-out holds on white until the scene is ready.
+        """
+        self.loader.start(name, loader)
+        if not self.loader.loading:
+            self.scene_loaded()
+
+    def scene_loaded(self):
+        """Add the scene the loader finished, pooling it when it is a level."""
+        self.add_scene(self.loader.name, self.loader.scene)
+        if self.loader.name == "game":
+            self.levels.put(self.current_level, self.loader.scene)
+
+    def enter_level(self, level_id):
+        """Switch to a level, reusing the pooled instance when there is one."""
+        self.current_level = level_id
+        level = self.levels.get(level_id)
+        if level is not None:
+            # on_enter() resets the states, score and ship of the pooled level
+            self.add_scene("game", level)
+        else:
+            self.load_scene("game", level_registry.level_class(level_id).loader(self.settings_object, self.screen, self.clock))
+        self.change_scene("game")
+
     def change_scene(self, name, state = "",transition_type="fade"):
         """Initiate a transition to the next scene."""
-        if name in self.scenes and not self.transitioning:
+        pending = self.loader.loading and name == self.loader.name
+        if not self.transitioning:
+            self.build_scene(name)
+        if (name in self.scenes or pending) and not self.transitioning:
             self.next_scene = name
             self.state_of_scene = state 
             self.transitioning = True
@@ -38,36 +139,36 @@ class SceneManager:
             self.transition_progress = 0
             
     def handle_events(self, event, detection_results, lock):
-        # Define a dictionary for level classes
-        level_classes = {
-            "level_1": Level1.Gameplaylevel1,
-            "level_2": Level2.Gameplaylevel2,
-        }
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler.toggle_overlay()
 
         # Delegate event handling to the current scene
         if not self.transitioning and self.current_scene:
             next_scene = self.current_scene.handle_events(event, detection_results, lock)
             
-            if next_scene in level_classes:
+            if next_scene in level_registry:
                 # Update the current level and switch to the new level
-                self.current_level = next_scene
-                self.add_scene("game", level_classes[next_scene](self.settings_object, self.screen, self.clock))
-                self.change_scene("game")
+                self.enter_level(next_scene)
             
             elif next_scene == "resume":
                 self.change_scene("game", "resume")
             
             elif next_scene == "restart":
-                # Restart the current level
-                self.purge_scene("game")
-                if self.current_level in level_classes:
-                    self.add_scene("game", level_classes[self.current_level](self.settings_object, self.screen, self.clock))
-                    self.change_scene("game")
+                # Restart the current level, a soft reset of the pooled instance
+                if self.current_level in level_registry:
+                    self.enter_level(self.current_level)
             
             elif next_scene == "title":
                 if self.settings_object.changes_needed or self.settings_object.check_changes():
                     # Reset screen with new settings
                     new_screen = self.settings_object.apply_image_changes(self.screen)
+                    # Pooled levels were built for the old screen, the next play loads them again,
+                    # so the sheets sliced for them are released too
+                    self.levels.clear()
+                    self.scenes.pop("game", None)
+                    frame_cache.purge()
+                    # A scene half pre-warmed for the old screen starts over
+                    self.prewarmer = SceneLoader()
                     
                     # Update screen for all scenes
                     for scene in self.scenes.values():
@@ -78,6 +179,7 @@ class SceneManager:
                     
                     # Update SceneManager's screen and reset changes flag
                     self.screen = new_screen
+                    overlays.invalidate()
                     self.settings_object.changes_needed = False
                 
                 self.change_scene(next_scene)
@@ -90,12 +192,24 @@ class SceneManager:
 
     def update(self):
         """Update the current scene or handle transition effects."""
+        with profiler.scope("scene.update"):
+            self._update()
+
+    def _update(self):
         if self.transitioning:
+            if self.loader.loading:
+                with profiler.scope("scene.load"):
+                    if self.loader.step():
+                        self.scene_loaded()
             self.transition_progress += self.transition_speed
             if self.transition_phase == "white_out" and self.transition_progress >= 1:
-                # Move to the transition phase after white-out
-                self.transition_phase = "transition"
-                self.transition_progress = 0
+                if self.next_scene not in self.scenes:
+                    # Stay white until the next scene has finished loading
+                    self.transition_progress = 1
+                else:
+                    # Move to the transition phase after white-out
+                    self.transition_phase = "transition"
+                    self.transition_progress = 0
             elif self.transition_phase == "transition" and self.transition_progress >= 1:
                 # Transition complete, set the new scene
                 self.current_scene = self.scenes[self.next_scene]
@@ -110,9 +224,29 @@ class SceneManager:
         else:
             if self.current_scene:
                 self.current_scene.update()
+            if self.prewarm_queue:
+                self._prewarm_step()
 
     def draw(self):
         """Draw the current scene and apply transition effects."""
+        # Scenes only redraw their changed regions when the last presented frame was their own
+        if self.transitioning or profiler.overlay or self.current_scene is not self.presented_scene:
+            for scene in (self.current_scene, self.scenes.get(self.next_scene)):
+                dirty = getattr(scene, "dirty", None)
+                if dirty is not None:
+                    dirty.force_full()
+        self.presented_scene = None if self.transitioning else self.current_scene
+        with profiler.scope("scene.draw"):
+            self._draw()
+        profiler.draw_overlay(self.screen)
+
+    def dirty_rects(self):
+        """Regions to pass to pygame.display.update(), or None when the whole frame has to be flipped."""
+        if self.transitioning or profiler.overlay or not hasattr(self.current_scene, "dirty_rects"):
+            return None
+        return self.current_scene.dirty_rects()
+
+    def _draw(self):
         if self.transitioning:
             if self.transition_phase == "white_out":
                 self.white_out_transition()
@@ -130,11 +264,8 @@ class SceneManager:
     def white_out_transition(self):
         """White out the screen."""
         eased_progress = self.ease_in_out(self.transition_progress)
-        white_surface = pygame.Surface(self.screen.get_size())
-        white_surface.fill((255, 255, 255))  # White-out color
         alpha = int(eased_progress * 255)
-        white_surface.set_alpha(alpha)
-        self.screen.blit(white_surface, (0, 0))
+        overlays.fill(self.screen, (255, 255, 255), alpha)  # White-out color
 
     def fade_transition(self):
         """Apply a fade transition effect."""
@@ -146,11 +277,8 @@ class SceneManager:
         if self.next_scene:
             self.scenes[self.next_scene].draw()
 
-        fade_surface = pygame.Surface(self.screen.get_size())
-        fade_surface.fill((255, 255, 255))  # Transition color (white fade)
         alpha = int((1 - eased_progress) * 255)
-        fade_surface.set_alpha(alpha)
-        self.screen.blit(fade_surface, (0, 0))
+        overlays.fill(self.screen, (255, 255, 255), alpha)  # Transition color (white fade)
 
     def slide_transition(self, direction):
         """Apply a slide transition effect."""
@@ -7,6 +7,8 @@ from Settings.AssesibilitySettings import AssessibilitySettingsScreen
 from Settings.SoundSettings import SoundSettingsScreen
 from Settings.ImageSetting import ImageSettingsScreen
 from resources.UIElements import Background
+from resources.dirtyrect import DirtyRegions
+from resources.textcache import text_cache
 from Settings.SoundManager import SoundManager
 
 # Colors
@@ -46,11 +48,12 @@ class SettingsScreen:
         self.active_screen = None
         self.last_update_time = time.time()
         self.start_time = time.time()
+        self.dirty = DirtyRegions(self.settings_manager.dirty_rendering)
         
     def on_enter(self):
         pass
     def apply_settings(self):
-        pass
+        self.background.resize(self.settings_manager.screen_width, self.settings_manager.screen_height)
     def loading_assets(self):
         script_dir = os.path.dirname(os.path.abspath(__file__))  # Current script directory
         assets_dir = os.path.join(script_dir, "..", "assets")  # Path to the assets directory
@@ -75,33 +78,44 @@ class SettingsScreen:
     def draw(self):
         if self.active_screen:
             self.subscreens[self.active_screen].draw()
+            # Subscreens draw the whole frame themselves
+            self.dirty.force_full()
         else:
             # Draw the main settings menu
-            self.screen.fill(WHITE)
-            self.background.draw(self.screen, 0)
-            self._draw_title()
+            self.dirty.begin(self.screen, self.draw_static)
             self._draw_menu_options()
 
-    def _draw_title(self):
+    def draw_static(self, surface):
+        """Draw the background and title, which do not change between frames."""
+        surface.fill(WHITE)
+        self.background.draw(surface, 0)
+        self._draw_title(surface)
+
+    def dirty_rects(self):
+        return self.dirty.collect()
+
+    def _draw_title(self, surface):
         title_text = "Settings"
-        title_surface = self.title_font.render(title_text, True, (238, 186, 255))
+        title_surface = text_cache.render(self.title_font, title_text, (238, 186, 255))
         title_width = title_surface.get_width()
         title_height = title_surface.get_height()
-        title_rect_x = (self.screen.get_width() - title_width) // 2
-        title_rect_y = self.screen.get_height() // 12
-        self.screen.blit(title_surface, (title_rect_x, title_rect_y))
+        title_rect_x = (surface.get_width() - title_width) // 2
+        title_rect_y = surface.get_height() // 12
+        surface.blit(title_surface, (title_rect_x, title_rect_y))
 
     def _draw_menu_options(self):
         y_pos = self.screen.get_height() // 4
         box_height = self.screen.get_height() // 14
         box_width = self.screen.get_width() // 2
         for i, setting in enumerate(self.settings_keys):
-            text_surface = self.font.render(setting, True, BLACK)
-            text_width = text_surface.get_width()
             x_pos = self.screen.get_width() // 2 - box_width // 2
             box_color = SELECTED_BOX_COLOR if i == self.selected_index else BOX_COLOR
-            self.draw_rounded_rect(self.screen, box_color, (x_pos, y_pos, box_width, box_height))
-            self.screen.blit(text_surface, (x_pos + (box_width - text_width) // 2, y_pos + 10))
+            box_rect = (x_pos, y_pos, box_width, box_height)
+            if self.dirty.refresh(self.screen, setting, box_color, box_rect):
+                text_surface = text_cache.render(self.font, setting, BLACK)
+                text_width = text_surface.get_width()
+                self.draw_rounded_rect(self.screen, box_color, box_rect)
+                self.screen.blit(text_surface, (x_pos + (box_width - text_width) // 2, y_pos + 10))
             y_pos += box_height + 30
 
     def handle_events(self, event, detection_results, lock):
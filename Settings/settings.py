@@ -4,7 +4,7 @@ import os
 
 class SettingsManager:
     def __init__(self, screen_width=1920, screen_height=1080, fps=120, full_screen=True,vsync = True, music_volume=0.5, sfx_volume=0.5, 
-                 grace_period=0.3, detection=False, motion_detection_sensitivity=0.5, sound_detection_sensitivity=30):
+                 grace_period=0.3, detection=False, motion_detection_sensitivity=0.5, sound_detection_sensitivity=30, dirty_rendering=False, weather_density=1.0):
         """
         Initializes the SettingsManager with default or provided values.
         """
@@ -19,6 +19,8 @@ class SettingsManager:
         self.detection = detection
         self.motion_detection_sensitivity = motion_detection_sensitivity
         self.sound_detection_sensitivity = sound_detection_sensitivity
+        self.dirty_rendering = dirty_rendering  # Menu screens only present the regions that changed
+        self.weather_density = weather_density  # Multiplier of the number of snowflakes, raindrops and stars
         self.grace_period_options = [0.1, 0.2, 0.3, 0.4, 0.5, 0.8, 1.0]
         self.sound_sensitivity_options = [20, 30, 40, 50]
         self.motion_sensitivity_options = [0.2, 0.5, 0.7]
@@ -68,6 +70,8 @@ class SettingsManager:
         self.detection = False
         self.motion_detection_sensitivity = 0.5
         self.sound_detection_sensitivity = 30
+        self.dirty_rendering = False
+        self.weather_density = 1.0
         self.save_settings()
         print("All settings have been reset to default values.")
 
@@ -104,7 +108,9 @@ class SettingsManager:
             "grace_period": self.grace_period,
             "detection": self.detection,
             "motion_detection_sensitivity": self.motion_detection_sensitivity,
-            "sound_detection_sensitivity": self.sound_detection_sensitivity
+            "sound_detection_sensitivity": self.sound_detection_sensitivity,
+            "dirty_rendering": self.dirty_rendering,
+            "weather_density": self.weather_density
         }
 
     def apply_settings_from_dict(self, settings_dict):
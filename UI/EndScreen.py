@@ -5,8 +5,10 @@ import os, sys
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(parent_dir)
 from resources.UIElements import Button, Background
+from resources.dirtyrect import DirtyRegions
 from Settings.settings import SettingsManager
 from Settings.SoundManager import SoundManager
+from resources.textcache import text_cache
 # Constants
 
 BUTTON_WIDTH = 350
@@ -99,8 +101,9 @@ class EndScreen:
         self.background_dark = Background(self.setting.screen_width, self.setting.screen_height, "night")
         self.selected_index = 0
         self.update_hover_states()
+        self.dirty = DirtyRegions(self.setting.dirty_rendering)
     def apply_settings(self):
-        pass
+        self.background_dark.resize(self.setting.screen_width, self.setting.screen_height)
     def loading_assets(self):
 
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -147,6 +150,8 @@ class EndScreen:
             self.latest_perfect = 0
             self.high_score = 0
         self.score_updated = True
+        # The results panel is part of the static layer
+        self.dirty.invalidate()
         
     def handle_events(self, event, detection_results, lock):
         def disengage():
@@ -236,19 +241,18 @@ class EndScreen:
             button.update(dt)
         self.background_dark.update(dt)
         self.last_frame_time = current_time
-    def draw(self):
-        
-        """Draw the title screen."""
-        def draw_game_over(self):
+    def draw_static(self, surface):
+        """Draw the background and the results panel, which do not change between frames."""
+        def draw_game_over(self, surface):
     # Draw the main panel
             panel_x, panel_y, panel_width, panel_height = 710, 150, 500, 780
-            pygame.draw.rect(self.screen, (252, 242, 247), (panel_x, panel_y, panel_width, panel_height), 0, 70)
-            pygame.draw.rect(self.screen, 'purple', (panel_x, panel_y, panel_width, panel_height), 5, 70)
+            pygame.draw.rect(surface, (252, 242, 247), (panel_x, panel_y, panel_width, panel_height), 0, 70)
+            pygame.draw.rect(surface, 'purple', (panel_x, panel_y, panel_width, panel_height), 5, 70)
 
             # Render and center "All Done!" text
-            game_over_text = self.game_over_font.render("All Done!", True, (191, 50, 156))
+            game_over_text = text_cache.render(self.game_over_font, "All Done!", (191, 50, 156))
             game_over_rect = game_over_text.get_rect(center=(panel_x + panel_width // 2, panel_y + 50))
-            self.screen.blit(game_over_text, game_over_rect)
+            surface.blit(game_over_text, game_over_rect)
 
             # Draw stars centered horizontally
             # Draw stars centered horizontally
@@ -270,35 +274,44 @@ class EndScreen:
             star_checks = [self.first_star_check, self.second_star_check, self.third_star_check]
             for pos, checked in zip(star_positions, star_checks):
                 if checked:
-                    pygame.draw.circle(self.screen, (232, 70, 113), pos, star_radius)
-                pygame.draw.circle(self.screen, 'purple', pos, star_radius, 1)
+                    pygame.draw.circle(surface, (232, 70, 113), pos, star_radius)
+                pygame.draw.circle(surface, 'purple', pos, star_radius, 1)
 
 
             # Draw statistics
             stats_texts = [("Perfect", 'purple', self.perfect), ("Missed", 'orange', self.misses)]
             for i, (label, color, value) in enumerate(stats_texts):
                 # Render the labels
-                stat_label = self.game_over_state_font.render(label, True, color)
+                stat_label = text_cache.render(self.game_over_state_font, label, color)
                 stat_label_rect = stat_label.get_rect(center=(panel_x + 150, 350 + i * 50))
-                self.screen.blit(stat_label, stat_label_rect)
+                surface.blit(stat_label, stat_label_rect)
 
                 # Render the values
-                stat_value = self.game_over_state_font.render(str(value), True, color)
+                stat_value = text_cache.render(self.game_over_state_font, str(value), color)
                 stat_value_rect = stat_value.get_rect(center=(panel_x + panel_width - 150, 350 + i * 50))
-                self.screen.blit(stat_value, stat_value_rect)
+                surface.blit(stat_value, stat_value_rect)
 
             # Render and center "Nice Try!" message
-            nice_try_text = self.game_over_message_font.render("Nice Try!", True, (232, 70, 113))
+            nice_try_text = text_cache.render(self.game_over_message_font, "Nice Try!", (232, 70, 113))
             nice_try_rect = nice_try_text.get_rect(center=(panel_x + panel_width // 2, 460))
-            self.screen.blit(nice_try_text, nice_try_rect)
+            surface.blit(nice_try_text, nice_try_rect)
 
 
-        self.screen.fill(WHITE)
-        self.background_dark.draw(self.screen, 0)
+        surface.fill(WHITE)
+        self.background_dark.draw(surface, 0)
+        if self.score_updated:
+            draw_game_over(self, surface)
+
+    def draw(self):
+        """Draw the title screen."""
+        self.dirty.begin(self.screen, self.draw_static)
         if self.score_updated:
-            draw_game_over(self)
             for button in self.buttons:
-                button.draw(self.screen, self.font)
+                if self.dirty.refresh(self.screen, button, (tuple(button.rect), button.is_hovered), button.rect):
+                    button.draw(self.screen, self.font)
+
+    def dirty_rects(self):
+        return self.dirty.collect()
         
 
 
@@ -3,9 +3,11 @@ from datetime import datetime
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(parent_dir)
 from resources.UIElements import Background, LevelBlock, Scoreboard
+from resources.dirtyrect import DirtyRegions
 # Constants
 from Settings.settings import SettingsManager
 from Settings.SoundManager import SoundManager
+from resources.textcache import text_cache
 
 
 
@@ -63,6 +65,18 @@ def process_scores_from_file(file_path):
 
 class LevelChooserScreen:
     def __init__(self, setting, screen):
+        for _ in self.load(setting, screen):
+            pass
+
+    @classmethod
+    def loader(cls, setting, screen):
+        """ Build the screen a loading phase at a time for a SceneLoader, returns the screen """
+        chooser = cls.__new__(cls)
+        yield from chooser.load(setting, screen)
+        return chooser
+
+    def load(self, setting, screen):
+        """ Constructor body, yields between loading phases so it can be spread over frames """
         self.screen = screen
         self.setting = setting 
         self.title_text = "What level do you want?"  # Game title
@@ -72,6 +86,7 @@ class LevelChooserScreen:
         self.sound_manager.set_sfx_volume(self.setting.sfx_volume)
         self.loading_assets()
         self.set_fonts()
+        yield
         # Adjust button alignment
         start_x = 2 * BUTTON_MARGIN  # Buttons aligned to the left with some margin
         start_y = self.setting.screen_height // 2 - (3.5 * BUTTON_HEIGHT + 2 * BUTTON_MARGIN) // 2
@@ -83,22 +98,26 @@ class LevelChooserScreen:
         self.start_time = time.time()
         self.last_frame_time = 0
         self.level_scores = process_scores_from_file("level_score.json")
-        # Buttons with updated start_x
-        self.buttons = [
-            LevelBlock("Level 1", start_x, start_y, BUTTON_WIDTH, BUTTON_HEIGHT, round(BUTTON_WIDTH), round(BUTTON_HEIGHT * 1.2), BUTTON_WIDTH * 2.2, BORDER_RADIUS),
-            LevelBlock("Level 2", start_x, start_y + BUTTON_HEIGHT + BUTTON_MARGIN, BUTTON_WIDTH, BUTTON_HEIGHT, round(BUTTON_WIDTH), round(BUTTON_HEIGHT * 1.2), BUTTON_WIDTH * 2.2, BORDER_RADIUS),
-            LevelBlock("Level 3", start_x, start_y + 2 * (BUTTON_HEIGHT + BUTTON_MARGIN), BUTTON_WIDTH, BUTTON_HEIGHT, round(BUTTON_WIDTH), round(BUTTON_HEIGHT * 1.2), BUTTON_WIDTH * 2.2, BORDER_RADIUS),
-            LevelBlock("Level 4", start_x, start_y + 3 * (BUTTON_HEIGHT + BUTTON_MARGIN), BUTTON_WIDTH, BUTTON_HEIGHT, round(BUTTON_WIDTH), round(BUTTON_HEIGHT * 1.2), BUTTON_WIDTH * 2.2, BORDER_RADIUS),
-            LevelBlock("Back to Title", start_x, start_y + 4.5 * (BUTTON_HEIGHT + BUTTON_MARGIN), BUTTON_WIDTH, BUTTON_HEIGHT, round(BUTTON_WIDTH * 1.1), round(BUTTON_HEIGHT * 1), BUTTON_WIDTH * 2.05, BORDER_RADIUS),
-        ]
-
-        self.background_dark = Background(self.setting.screen_width, self.setting.screen_height, "night")
+        # Buttons with updated start_x, one per loading phase
+        self.buttons = []
+        for text, y, width, height, expanded_width in (
+            ("Level 1", start_y, round(BUTTON_WIDTH), round(BUTTON_HEIGHT * 1.2), BUTTON_WIDTH * 2.2),
+            ("Level 2", start_y + BUTTON_HEIGHT + BUTTON_MARGIN, round(BUTTON_WIDTH), round(BUTTON_HEIGHT * 1.2), BUTTON_WIDTH * 2.2),
+            ("Level 3", start_y + 2 * (BUTTON_HEIGHT + BUTTON_MARGIN), round(BUTTON_WIDTH), round(BUTTON_HEIGHT * 1.2), BUTTON_WIDTH * 2.2),
+            ("Level 4", start_y + 3 * (BUTTON_HEIGHT + BUTTON_MARGIN), round(BUTTON_WIDTH), round(BUTTON_HEIGHT * 1.2), BUTTON_WIDTH * 2.2),
+            ("Back to Title", start_y + 4.5 * (BUTTON_HEIGHT + BUTTON_MARGIN), round(BUTTON_WIDTH * 1.1), round(BUTTON_HEIGHT * 1), BUTTON_WIDTH * 2.05),
+        ):
+            self.buttons.append(LevelBlock(text, start_x, y, BUTTON_WIDTH, BUTTON_HEIGHT, width, height, expanded_width, BORDER_RADIUS))
+            yield
+
+        self.background_dark = yield from Background.loader(self.setting.screen_width, self.setting.screen_height, "night")
         self.last_update_time = time.time()
         self.selected_index = 0
         
         # Pre-create scoreboards
         self.scoreboards = self.create_all_scoreboards()
         self.current_scoreboard = None
+        self.dirty = DirtyRegions(self.setting.dirty_rendering)
 
     def on_enter(self):
         pass
@@ -172,7 +191,7 @@ class LevelChooserScreen:
                 button.unselect()
     
     def apply_settings(self):
-        pass
+        self.background_dark.resize(self.setting.screen_width, self.setting.screen_height)
     
     def handle_events(self, event, detection_results, lock):
         current_time = time.time()
@@ -275,25 +294,37 @@ class LevelChooserScreen:
         self.background_dark.update(dt)
         self.last_frame_time = current_time
 
-    def draw(self):
-        """Draw the level chooser screen."""
-        self.screen.fill(WHITE)
-        self.background_dark.draw(self.screen, 0)
+    def draw_static(self, surface):
+        """Draw the background and title, which do not change between frames."""
+        surface.fill(WHITE)
+        self.background_dark.draw(surface, 0)
 
         # Draw title
-        title_surface = self.title_font.render(self.title_text, True, (238, 186, 255))
+        title_surface = text_cache.render(self.title_font, self.title_text, (238, 186, 255))
         title_rect = title_surface.get_rect(center=(self.setting.screen_width // 2, self.setting.screen_height // 6))
-        self.screen.blit(title_surface, title_rect)
+        surface.blit(title_surface, title_rect)
+
+    def draw(self):
+        """Draw the level chooser screen."""
+        self.dirty.begin(self.screen, self.draw_static)
 
         # Draw buttons
         for button in self.buttons:
-            button.draw(self.screen, self.font)
+            rect = pygame.Rect(button.x + button.offset_x, button.y, button.width, button.height)
+            if self.dirty.refresh(self.screen, button, (tuple(rect), button.selected), rect):
+                button.draw(self.screen, self.font)
 
         # Draw the current scoreboard if applicable
         if self.current_scoreboard:
-            scoreboard_surface = self.current_scoreboard.draw()
-            scoreboard_rect = scoreboard_surface.get_rect(center=(self.setting.screen_width // 1.2, self.setting.screen_height // 1.7))
-            self.screen.blit(scoreboard_surface, scoreboard_rect)
+            scoreboard_rect = self.current_scoreboard.surface.get_rect(center=(self.setting.screen_width // 1.2, self.setting.screen_height // 1.7))
+            if self.dirty.refresh(self.screen, "scoreboard", id(self.current_scoreboard), scoreboard_rect):
+                scoreboard_surface = self.current_scoreboard.draw()
+                self.screen.blit(scoreboard_surface, scoreboard_rect)
+        else:
+            self.dirty.remove(self.screen, "scoreboard")
+
+    def dirty_rects(self):
+        return self.dirty.collect()
 
 if __name__ == "__main__":
     # Initialize Pygame
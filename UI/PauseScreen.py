@@ -3,8 +3,10 @@ import time, sys, os
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(parent_dir)
 from resources.UIElements import Button, Background
+from resources.dirtyrect import DirtyRegions
 from Settings.settings import SettingsManager
 from Settings.SoundManager import SoundManager
+from resources.textcache import text_cache
 # Constants
 
 BUTTON_WIDTH = 350
@@ -46,6 +48,7 @@ class PauseScreen:
         self.start_time = time.time()
         self.selected_index = 0
         self.update_hover_states()
+        self.dirty = DirtyRegions(self.setting.dirty_rendering)
 
     def loading_assets(self):
 
@@ -61,7 +64,7 @@ class PauseScreen:
         self.title_font = pygame.font.Font(self.bold_font_path, 100)
 
     def apply_settings(self):
-        pass
+        self.background_dark.resize(self.setting.screen_width, self.setting.screen_height)
     def update_hover_states(self):
         """Update which button is hovered based on the selected index."""
         for i, button in enumerate(self.buttons):
@@ -169,15 +172,23 @@ class PauseScreen:
         self.background_dark.update(dt)
         self.last_frame_time = current_time
 
+    def draw_static(self, surface):
+        """Draw the background and title, which do not change between frames."""
+        surface.fill(WHITE)
+        self.background_dark.draw(surface, 0)
+        title_surface = text_cache.render(self.title_font, self.title_text, (238, 186, 255))
+        title_rect = title_surface.get_rect(center=(self.setting.screen_width // 2, self.setting.screen_height // 2 - 300))
+        surface.blit(title_surface, title_rect)
+
     def draw(self):
         """Draw the title screen."""
-        self.screen.fill(WHITE)
-        self.background_dark.draw(self.screen, 0)
-        title_surface = self.title_font.render(self.title_text, True, (238, 186, 255))
-        title_rect = title_surface.get_rect(center=(self.setting.screen_width // 2, self.setting.screen_height // 2 - 300))
-        self.screen.blit(title_surface, title_rect)
+        self.dirty.begin(self.screen, self.draw_static)
         for button in self.buttons:
-            button.draw(self.screen, self.font)
+            if self.dirty.refresh(self.screen, button, (tuple(button.rect), button.is_hovered), button.rect):
+                button.draw(self.screen, self.font)
+
+    def dirty_rects(self):
+        return self.dirty.collect()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,15 @@
 import pygame
 import sys, os
 import time, math, random
+import numpy as np
 
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(parent_dir)
-from resources.UIElements import Button, Background, Stars
+from resources.UIElements import Button, Background
 from Settings.settings import SettingsManager
 from Settings.SoundManager import SoundManager
 from resources.tools import load_frames_from_spritesheet, BackgroundArtifacts
-from resources.environment import MusicStaff, generate_bird_positions
+from resources.environment import MusicStaff, Precipitation, generate_bird_positions
 # Constants
 
 BUTTON_WIDTH = 350
@@ -38,50 +39,10 @@ class Ship(pygame.sprite.Sprite):
             self.image = self.frames[self.current_frame]
             self.accumulated_time = 0  # Reset accumulated time after switching frame
 
-class Stars(pygame.sprite.Sprite):
-    def __init__(self, x, y, move_direction, radius=1):
-        super().__init__()
-        self.image = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)  # Surface with transparency
-        self.image.fill((0, 0, 0, 0))  # Transparent fill
-        pygame.draw.circle(self.image, (255, 255, 255), (radius, radius), radius)  # Draw a white circle (star)
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)  # Position the star at the specified coordinates
-        self.speed = random.randint(1,3)
-        self.move_direction = move_direction
-        
-    def update(self, screen_width, dt):
-        self.rect.x += self.move_direction * math.ceil(self.speed * dt)
-        
-        # Keep stars within bounds (reset to the other side)
-        if self.rect.x < 0:
-            self.rect.x = screen_width  # Reset to the right side
-        elif self.rect.x > screen_width:
-            self.rect.x = 0  # Reset to the left side
-
-class Bird(pygame.sprite.Sprite):
-    def __init__(self, x, y, move_direction, speed, radius=1):
-        super().__init__()
-        self.image = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)  # Surface with transparency
-        #self.image.fill((0, 0, 0, 0))  # Transparent fill
-        #pygame.draw.circle(self.image, (255, 255, 255), (radius, radius), radius)  # Draw a white circle (star)
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)  # Position the star at the specified coordinates
-        self.speed = speed
-        self.move_direction = move_direction
-
-    def update(self, frame,screen_width, dt):
-        self.image = frame
-        self.rect.x += self.move_direction * math.ceil(self.speed * dt)
-        
-        # Keep stars within bounds (reset to the other side)
-        if self.rect.x < 0:
-            self.rect.x = screen_width  # Reset to the right side
-        elif self.rect.x > screen_width:
-            self.rect.x = 0  # Reset to the left side
-
-class BirdGroup(pygame.sprite.Group):
-    def __init__(self, bird_frames, *sprites):
-        super().__init__(*sprites)
+class BirdFlock(Precipitation):
+    """Birds drifting right, all flapping through the same animation frame."""
+    def __init__(self, bird_frames, screen_width, screen_height):
+        super().__init__(screen_width, screen_height, axis=0, rounding=np.ceil)
         self.bird_frames = bird_frames
         self.frame_delay_static = 50 / 1000
         self.frame_delay_collision = 1 / 2000
@@ -89,16 +50,20 @@ class BirdGroup(pygame.sprite.Group):
         self.frame_delay = self.frame_delay_static
         self.current_frame = 0
         self.image = pygame.Surface((1,1), pygame.SRCALPHA)
-    def update(self, screen_width, dt):
+
+    def update(self, dt):
         self.accumulated_time += dt
         if self.accumulated_time >= self.frame_delay:
             self.current_frame = (self.current_frame + 1) % 18
             self.accumulated_time = 0
             self.image = self.bird_frames[self.current_frame]
-        super().update(self.image, screen_width, dt)
+        super().update(dt)
+
+    def draw(self, surface):
+        super().draw(surface, self.image)
 
 class TitleBackground():
-    def __init__(self, screen_width, screen_height, image_path, bird_path):
+    def __init__(self, screen_width, screen_height, image_path, bird_path, density=1.0):
 
         self.width = screen_width
         self.height = screen_height  # Half the screen height
@@ -141,30 +106,29 @@ class TitleBackground():
         self.image.blit(gradient2_layer.image, (0, self.height*2/20))
         # Load frames from the spritesheet (parallax layers)
 
-        # Pre-render snowflake images
         self.create_birds(50)
-        # Re-create snow with optimized snowflakes
-        self.stars_group = pygame.sprite.Group()
-        self.create_stars(200)
+        self.stars = Precipitation(self.width, self.height, axis=0, rounding=np.ceil)
+        self.create_stars(round(200 * density))
         
     def create_birds(self, num_birds = 100):
         self.bird_frames, bird_width, bird_height = load_frames_from_spritesheet(self.bird_path, 24, 1)
-        self.birds_group = BirdGroup(self.bird_frames)
-        bird_positions = generate_bird_positions(num_birds, self.width, self.height*5/6)
-        for position in bird_positions:
-            bird = Bird(round(position[0]), round(position[1]), 1, position[2])
-            self.birds_group.add(bird)
+        self.birds = BirdFlock(self.bird_frames, self.width, self.height)
+        bird_positions = np.array(generate_bird_positions(num_birds, self.width, self.height*5/6))
+        # Birds are placed by their centre, their rect is 2x2 until the first frame is shown
+        self.birds.add([self.birds.image] * num_birds, np.rint(bird_positions[:, :2]) - 1, bird_positions[:, 2])
+
     def create_stars(self, num_drops=500):
-        for _ in range(num_drops):
-            x = random.randint(0, self.width)
-            y = random.randint(-self.height, self.height//3)
-            speed = random.uniform(500, 550)
-            star = Stars(x, y, 1, 2)
-            self.stars_group.add(star)
+        radius = 2
+        star_image = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)  # Surface with transparency
+        pygame.draw.circle(star_image, (255, 255, 255), (radius, radius), radius)  # Draw a white circle (star)
+        positions = np.column_stack((np.random.randint(0, self.width + 1, num_drops),
+                                     np.random.randint(-self.height, self.height//3 + 1, num_drops))) - radius
+        speeds = np.random.randint(1, 4, num_drops)
+        self.stars.add([star_image] * num_drops, positions, speeds)
 
     def update(self, dt):
-        self.stars_group.update(self.width, dt)
-        self.birds_group.update(self.width, dt)
+        self.stars.update(dt)
+        self.birds.update(dt)
         self.layers_group.update(dt)
 
     def draw(self, surface, y_pos):
@@ -173,10 +137,9 @@ class TitleBackground():
         for i, artifact in enumerate(self.layers_group):
             artifact.draw(self.background_surface)
             if i == 0:
-                self.stars_group.draw(self.background_surface)
+                self.stars.draw(self.background_surface)
             elif i == 1:
-                for bird in self.birds_group:
-                    self.background_surface.blit(bird.image, bird.rect)
+                self.birds.draw(self.background_surface)
         surface.blit(self.background_surface, (0, y_pos))
 
 class TitleScreen:
@@ -245,8 +208,8 @@ class TitleScreen:
         {"amplitude": 50, "frequency": 0.001, "speed": 1.2, "offset": -math.pi / 2, "y_offset": self.setting.screen_height * 0.15 + 75 * i}
         for i in range(5)]
         separator_positions = [20, self.setting.screen_width - 100]
-        self.music_staff = MusicStaff(self.setting.screen_width, self.setting.screen_height, wave_params, self.clef_path, separator_positions)
-        self.background = TitleBackground(self.setting.screen_width, self.setting.screen_height, self.background_path, self.bird_path)
+        self.music_staff = MusicStaff(self.setting.screen_width, self.setting.screen_height, wave_params, self.clef_path, separator_positions, sample_stride=8)
+        self.background = TitleBackground(self.setting.screen_width, self.setting.screen_height, self.background_path, self.bird_path, self.setting.weather_density)
 
     def apply_settings(self):
         pass
@@ -0,0 +1,829 @@
+import pygame
+import os, sys
+import time, random
+from dataclasses import dataclass, field
+import numpy as np
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(parent_dir)
+from resources.UIElements import create_smooth_rainbow_gradient, create_horizontal_gradient_surface, iter_horizontal_gradient_surface, Background
+from Settings.settings import SettingsManager
+from Settings.SoundManager import SoundManager
+from resources.tools import load_frames_from_spritesheet, iter_spritesheet, prefetch_spritesheets, BackgroundArtifacts, update_score, EffectManager
+from resources.environment import Trailing, ParticleEngine, Precipitation
+from resources.beatmap import load_chart, NoteTable
+from resources.profiler import profiler
+from resources.textcache import text_cache
+from resources.gameplay import ObstacleAtlas, ObstacleGroup, NoteScheduler, JudgementEngine, held_lanes
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets")
+
+
+@dataclass(frozen=True)
+class LevelDescriptor:
+    """
+    Everything that makes one level differ from another.
+
+    Asset names are relative to the assets directory, the chart and music to
+    assets/tracks. A level module builds one of these and hands it to a
+    GameplayLevel subclass; levels.registry maps level ids to those classes.
+    """
+    level_id: str
+    chart: str
+    music: str
+    ship_sheet: str
+    ship_frames: int
+    background_sheet: str
+    background_frames: int
+    # Parallax layers back to front: name -> {"asset": frame index, "speed": factor of background_speed, "y_offset": pixels}
+    layers: dict
+    background_speed: float
+    sky: object = "night"  # "night", or (bottom, top) colors of a custom gradient
+    weather: str = "snow"  # "snow" or "rain"
+    lightning: bool = False
+    obstacle_sheet: str = "purple note.png"
+    hit_obstacle_sheet: str = "blue note.png"
+    sounds: dict = field(default_factory=lambda: {"hit_sound": "HitSoundEffect.wav"})
+    obstacle_speed: float = 700
+    guideline_speed: float = 450
+    guideline_alpha: int = 150  # Alpha of a guideline the ship is not on
+    # Ship movement and animation
+    ship_speed_up: float = 1000
+    ship_speed_down: float = 975
+    hop_speed: float = 5000  # None: the trigger is an action and does not move the ship
+    ship_frame_delay: float = 30 / 1000
+    ship_collision_frame_delay: float = 1 / 2000
+    # Lane rules
+    single_lane: str = "up"  # Lane of every single note, None places them by their own placement
+    two_handed: bool = False  # Detection needs both hands up (or down) to change lanes
+    judge_options: dict = field(default_factory=dict)  # Extra JudgementEngine keyword arguments
+
+    def asset(self, name):
+        return os.path.join(ASSETS_DIR, name)
+
+    def track(self, name):
+        return os.path.join(ASSETS_DIR, "tracks", name)
+
+
+class LevelBackground(Background):
+    """ Parallax layers from the level's sheet over its sky, with snow or rain and optional lightning """
+    def __init__(self, screen_width, screen_height, descriptor, density=1.0):
+        for _ in self.load(screen_width, screen_height, descriptor, density):
+            pass
+
+    def load(self, screen_width, screen_height, descriptor, density=1.0):
+        """ Constructor body, yields after the sky, the lightning and every layer """
+        if descriptor.sky == "night":
+            yield from super().load(screen_width, screen_height, "night", None)
+        else:
+            yield from super().load(screen_width, screen_height, "custom", None, *descriptor.sky)
+
+        # Load frames from the spritesheet (parallax layers)
+        self.assets, self.frame_width, self.frame_height = yield from iter_spritesheet(descriptor.asset(descriptor.background_sheet), descriptor.background_frames, 1)
+        self.base_speed = descriptor.background_speed
+
+        self.effects = None
+        if descriptor.lightning:
+            self.lightning_texture = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+            yield
+            self.lightning_texture.blit((yield from iter_horizontal_gradient_surface(self.lightning_texture.get_rect(), (132, 132, 138),(32, 32, 33))))
+            self.effects = EffectManager(self.lightning_texture)
+            yield
+
+        # Create artifacts for each layer
+        self.layers_group = pygame.sprite.Group()
+        for layer, config in descriptor.layers.items():
+            artifact = BackgroundArtifacts(
+                self.frame_width,
+                self.frame_height,
+                screen_width,
+                screen_height,
+                config["speed"] * self.base_speed,
+                config["y_offset"],
+                self.assets[config["asset"]]
+            )
+            self.layers_group.add(artifact)
+            yield
+
+        if descriptor.weather == "rain":
+            self.rain_color = (197,226,247)
+            self.precipitation = self.rain = Precipitation(self.width, self.height)
+            self.create_rain(round(300 * density))
+        else:
+            self.precipitation = self.snow = Precipitation(self.width, self.height)
+            self.create_snow(round(300 * density))
+        yield
+
+    def create_snow(self, num_drops=500):
+        images = {}
+        for length in [2, 4, 6]:
+            surface = pygame.Surface((length, length), pygame.SRCALPHA)
+            pygame.draw.line(surface, (255, 255, 255), (length // 2, 0), (length // 2, length), 1)
+            pygame.draw.line(surface, (255, 255, 255), (0, length // 2), (length, length // 2), 1)
+            images[length] = surface
+        lengths = np.random.choice([2, 4, 6], num_drops)
+        positions = np.column_stack((np.random.randint(0, self.width + 1, num_drops),
+                                     np.random.randint(-self.height, self.height + 1, num_drops)))
+        speeds = np.random.uniform(200, 250, num_drops)
+        self.snow.add([images[length] for length in lengths.tolist()], positions, speeds)
+
+    def create_rain(self, num_drops=500):
+        images = {}
+        for length in [15, 20, 25, 30]:
+            surface = pygame.Surface((4, length), pygame.SRCALPHA)
+            pygame.draw.line(surface, self.rain_color, (0, 0), (0, length), 4)
+            images[length] = surface
+        lengths = np.random.choice([15, 20, 25, 30], num_drops)
+        positions = np.column_stack((np.random.randint(0, self.width + 1, num_drops),
+                                     np.random.randint(-self.height, self.height + 1, num_drops)))
+        speeds = np.random.uniform(1500, 1650, num_drops)
+        # Drops restart three lengths above the screen
+        self.rain.add([images[length] for length in lengths.tolist()], positions, speeds, -3 * lengths)
+
+    def update(self, dt):
+        self.precipitation.update(dt)
+        self.layers_group.update(dt)
+        if self.effects is not None:
+            self.effects.update(dt)
+
+    def draw(self, surface, y_pos):
+        # Gradient and moon come pre-baked in the static layer
+        canvas = self.begin_frame(surface, y_pos)
+        for artifact in self.layers_group:
+            artifact.draw(canvas)
+
+        self.precipitation.draw(canvas)
+        if self.effects is not None:
+            self.effects.draw(canvas)
+        self.end_frame(surface, y_pos)
+        
+class Guideline(pygame.sprite.Sprite):
+    border_radius = 30
+    def __init__(self, x, guideline_y, width, height, note, unaligned_alpha=150):
+        super().__init__()
+        self.image = pygame.Surface((width, height), pygame.SRCALPHA)  # Create a surface for the image
+        self.rect = self.image.get_rect()  # Get the rectangle that defines the surface size and position
+        self.total_correct_frames = 0
+        self.fill_surface, self.rainbow_surface, self.align_surface = Guideline.gradients(self.rect)
+        self.note = note
+        self.unaligned_alpha = unaligned_alpha
+        self.unalign()
+        self.correct_frames = 0
+        # Adjust the rect's y position based on the center y of the guideline
+        self.rect.x = x
+        self.rect.centery = guideline_y  # Now center of the guideline, not top-left
+        self.aligned = False
+        self.score_timer = 0
+
+    @staticmethod
+    def gradients(rect):
+        """ Fill, rainbow and aligned gradients of a guideline, shared through the gradient cache """
+        return (create_horizontal_gradient_surface(rect, (204, 191, 121), (255, 239, 151), Guideline.border_radius),
+                create_smooth_rainbow_gradient(rect, Guideline.border_radius),
+                create_horizontal_gradient_surface(rect, (250, 216, 157), (250, 150, 122), Guideline.border_radius))
+
+    def update(self, x=None):
+        # If x is provided, update the x position of the guideline
+        if x is not None:
+            self.rect.x = x
+
+    def move(self, speed, dt):
+        """Move the guideline left or right depending on speed."""
+        self.rect.x -= round(speed * dt)
+
+    def align(self):
+        self.image.blit(self.align_surface, (0, 0))
+        self.aligned = True
+        self.image.set_alpha(200)
+
+    def unalign(self):
+        self.image.blit(self.fill_surface, (0, 0))
+        self.aligned = False
+        self.image.set_alpha(self.unaligned_alpha)
+    def collided(self):
+        self.image.set_alpha(225)
+        self.image.blit(self.rainbow_surface, (0, 0))
+    @property
+    def guideline_y(self):
+        return self.rect.centery  # Return the center y (not the top-left y)
+
+class ship(pygame.sprite.Sprite):
+    def __init__(self, x, y, width, height, image_path, frame_count, spring_direction='down', orientation='right', min_y=0, max_y=0,
+                 speed_up=1000, speed_down=975, hop_speed=5000, frame_delay=30 / 1000, collision_frame_delay=1 / 2000, screen_height=None):
+        super().__init__()
+
+        self.current_frame = 0
+        self.frame_delay_static = frame_delay
+        self.frame_delay_collision = collision_frame_delay
+        self.frame_delay = self.frame_delay_static
+        self.basic_frames, self.frame_width, self.frame_height = load_frames_from_spritesheet(image_path, frame_count, 1)
+        self.gray_frames = [pygame.transform.grayscale(frame) for frame in self.basic_frames]
+        self.image = self.gray_frames[self.current_frame]
+        self.rect = self.image.get_rect()
+        self.rect.x = x
+        self.rect.y = y
+        self.start_y = y
+        self.collided = False
+        self.accumulated_time = 0
+
+        # Both trails share one particle engine, their particles stay within the screen's height
+        self.particle_engine = ParticleEngine(140)
+        self.trailing = {"static" :Trailing(
+            height=round(height//3), 
+            width=round(self.rect.centerx - width/4),
+            speed = 100,
+            left_wall=0,
+            right_wall=round(self.rect.centerx - width/4), 
+            num_particles=40, 
+            move_direction=-1,  # Move left to match ship
+            shape="circle",
+            engine=self.particle_engine,
+            bottom_wall=screen_height
+        ), "collision":Trailing(
+            height=round(height//2), 
+            width=round(self.rect.centerx - width/4),
+            speed = 800,
+            left_wall=0, 
+            right_wall=round(self.rect.centerx - width/4), 
+            num_particles=100, 
+            move_direction=-1,  # Move left to match ship
+            shape="square",
+            engine=self.particle_engine,
+            bottom_wall=screen_height)}
+        self.current_trailing = self.trailing["static"]
+        
+        # Movement parameters
+        self.y = y
+        self.speed_up = speed_up
+        self.speed_down = speed_down
+        self.hop_speed = hop_speed  # None when the trigger does not move the ship
+        self.spring_direction = spring_direction
+        self.orientation = orientation
+        self.min_y = min_y
+        self.max_y = max_y
+        
+
+        # Overshoot parameters
+        self.overshoot_amount = 5
+        self.return_speed = 2000
+        self.overshoot_timer = 0
+        self.overshoot_duration = 0.05
+        self.is_moving_up = False
+        self.is_moving_down = False
+        self.in_overshoot = False
+        self.initial_press = True
+        self.up_pressed = False
+        self.down_pressed = False
+        self.trigger_pressed = False
+        
+    def reset(self):
+        """ Put the ship back where and how it started, for a level that is played again """
+        self.current_frame = 0
+        self.frame_delay = self.frame_delay_static
+        self.image = self.gray_frames[self.current_frame]
+        self.rect.y = self.start_y
+        self.y = self.start_y
+        self.collided = False
+        self.accumulated_time = 0
+        self.current_trailing = self.trailing["static"]
+        self.overshoot_timer = 0
+        self.is_moving_up = False
+        self.is_moving_down = False
+        self.in_overshoot = False
+        self.initial_press = True
+        self.up_pressed = False
+        self.down_pressed = False
+        self.trigger_pressed = False
+
+    def update(self, dt):
+        if self.collided:
+            self.current_trailing = self.trailing["collision"]
+            self.frame_delay = self.frame_delay_collision
+        else:
+            self.current_trailing = self.trailing["static"]
+            self.frame_delay = self.frame_delay_static
+        """
+        Update the animation frame based on accumulated delta time.
+        The frame shifts once the accumulated time exceeds the threshold (frame_delay).
+        """
+        self.accumulated_time += dt  # Accumulate the delta time
+
+        # If accumulated time exceeds the threshold, shift to the next frame
+        if self.accumulated_time >= self.frame_delay:
+            self.current_frame = (self.current_frame + 1) % len(self.basic_frames)
+            if self.collided:
+                self.image = self.basic_frames[self.current_frame]
+            else:
+                self.image = self.gray_frames[self.current_frame]
+            self.accumulated_time = 0  # Reset accumulated time after switching frame
+        self.current_trailing.update(dt)
+
+    def move(self, dt, up_pressed, down_pressed, trigger_pressed):
+        # Check for new button presses
+        self.up_pressed = up_pressed
+        self.down_pressed = down_pressed
+        self.trigger_pressed = trigger_pressed
+        # The trigger hops upwards on ships that can hop
+        hop_pressed = trigger_pressed and self.hop_speed is not None
+        
+        # Determine movement state
+        if (up_pressed or hop_pressed) and not self.is_moving_up:
+            self.is_moving_up = True
+            self.is_moving_down = False
+            self.in_overshoot = True
+            self.overshoot_timer = 0
+            self.initial_press = True
+
+        elif down_pressed and not self.is_moving_down:
+            self.is_moving_down = True
+            self.is_moving_up = False
+            self.in_overshoot = True
+            self.overshoot_timer = 0
+            self.initial_press = True
+        
+        # Reset states when buttons are released
+        if not (up_pressed or hop_pressed):
+            self.is_moving_up = False
+        if not down_pressed:
+            self.is_moving_down = False
+
+        # Unified upward movement logic
+        is_moving_upward = self.is_moving_up or (hop_pressed and self.is_moving_up)
+        movement_speed = self.hop_speed if hop_pressed else self.speed_up
+        
+        if is_moving_upward:
+            if self.in_overshoot:
+                if self.initial_press:
+                    # Initial overshoot movement
+                    target = self.min_y - self.overshoot_amount
+                    self.y = max(target, self.y - movement_speed * dt)
+                    if self.y <= target:
+                        self.initial_press = False
+                        self.overshoot_timer = 0
+                else:
+                    # Return from overshoot
+                    self.overshoot_timer += dt
+                    if self.overshoot_timer >= self.overshoot_duration:
+                        self.y = min(self.min_y, self.y + self.return_speed * dt)
+                        if self.y >= self.min_y:
+                            self.in_overshoot = False
+            else:
+                # Stay at boundary
+                self.y = self.min_y
+                
+        elif self.is_moving_down:
+            if self.in_overshoot:
+                if self.initial_press:
+                    # Initial overshoot movement
+                    target = self.max_y + self.overshoot_amount
+                    self.y = min(target, self.y + self.speed_down * dt)
+                    if self.y >= target:
+                        self.initial_press = False
+                        self.overshoot_timer = 0
+                else:
+                    # Return from overshoot
+                    self.overshoot_timer += dt
+                    if self.overshoot_timer >= self.overshoot_duration:
+                        self.y = max(self.max_y, self.y - self.return_speed * dt)
+                        if self.y <= self.max_y:
+                            self.in_overshoot = False
+            else:
+                # Stay at boundary
+                self.y = self.max_y
+        else:
+            # Return to rest position when no keys are pressed
+            if self.spring_direction == 'down':
+                rest_y = self.start_y
+            if self.y < rest_y:
+                self.y = min(rest_y, self.y + self.speed_down * dt)
+            elif self.y > rest_y:
+                self.y = max(rest_y, self.y - self.speed_up * dt)
+
+        # Update sprite position
+        self.rect.y = round(self.y - self.rect.height // 2)
+
+def beat_processing(filename):
+    """
+    Loads a beat map into a NoteTable.
+
+    The text beat map is compiled once into a binary chart next to it (see
+    resources/beatmap.py). Later calls, including every restart, only read
+    the memory-mapped records and reuse the precomputed maximum score.
+    The records are copied into NumPy arrays in one step, the table's
+    ``notes`` list gives one view object per note.
+
+    Parameters:
+        filename (str): Path to the beat map file.
+
+    Returns:
+        tuple: 
+            - notes (NoteTable): The notes of the beat map.
+            - max_score (int): The maximum score achievable for the beat map.
+
+    Raises:
+        ValueError: If the file contains invalid lines or unknown placement codes.
+    """
+    chart = load_chart(filename)
+    return NoteTable.from_chart(chart), chart.max_score
+
+class GameplayLevel:
+    """
+    The gameplay scene shared by every level.
+
+    Subclasses only set descriptor; chart, assets, speeds, lane rules and
+    background all come from it.
+    """
+    descriptor = None
+
+    def __init__(self, setting, screen, clock):
+        for _ in self.load(setting, screen, clock):
+            pass
+
+    @classmethod
+    def loader(cls, setting, screen, clock):
+        """ Build the level a loading phase at a time for a SceneLoader, returns the level """
+        level = cls.__new__(cls)
+        yield from level.load(setting, screen, clock)
+        return level
+
+    def load(self, setting, screen, clock):
+        """ Constructor body, yields between loading phases so it can be spread over frames """
+        self.screen = screen
+        self.setting = setting
+        self.clock = clock
+        self.sound_manager = SoundManager()
+        # Colors
+        self.WHITE = (255, 255, 255)
+        self.BLACK = (0, 0, 0)
+        self.PURPLE = (128, 0, 128)
+        self.PINK = (255, 192, 203)
+
+        # Sprite Groups
+        self.all_sprites = pygame.sprite.Group()
+        self.guidelines_group = pygame.sprite.Group()
+
+        # Gameplay parameters
+        self.grace_period = self.setting.grace_period
+
+        self.sound_manager.set_music_volume(self.setting.music_volume) 
+        self.sound_manager.set_sfx_volume(self.setting.sfx_volume)
+
+        self.obstacle_speed = self.descriptor.obstacle_speed
+        self.guideline_speed = self.descriptor.guideline_speed
+        self.ship_screen_width, self.ship_screen_height = 120, 120
+        self.score_line_length = 600
+        self.score_line_width = 14
+        if not self.setting.detection:
+            self.detection_result = {
+                "detection_of_sensors": False,
+                "right_hand_up": False,
+                "left_hand_up": False,
+                "right_hand_down": False,
+                "left_hand_down": False,
+                "clapped": False,
+                "cross_arm": False,
+                "ended": False
+            }
+        
+        # Clock read by the level, the headless driver injects a simulated one
+        self.time_source = time.time
+
+        self.loading_assets()
+        # Decode the sheets on a worker thread and come back once each is ready
+        for decoding in prefetch_spritesheets(self.background_path, self.ship_path, self.obstacle_path, self.hit_obstacle_path):
+            yield decoding
+        self.obstacles_group = ObstacleGroup(ObstacleAtlas(self.obstacle_path, self.hit_obstacle_path))
+        yield
+        self.set_fonts()
+        yield
+        # Slice the ship's sheet a frame at a time, the ship then finds it cached
+        yield from iter_spritesheet(self.ship_path, self.descriptor.ship_frames, 1)
+        
+        yield from self.create_background()
+        self.reset_states()
+        yield
+        self.reset_score()
+        yield
+        yield from self.prepare_guidelines()
+
+        # Create ships
+        self.ship = ship(self.setting.screen_width/8, self.setting.screen_height/2, self.ship_screen_width, self.ship_screen_height, self.ship_path,
+                         self.descriptor.ship_frames, spring_direction='down', orientation='left',
+                         min_y=self.setting.screen_height/2 - self.setting.screen_height/4, max_y=self.setting.screen_height/2 + self.setting.screen_height/4,
+                         speed_up=self.descriptor.ship_speed_up, speed_down=self.descriptor.ship_speed_down, hop_speed=self.descriptor.hop_speed,
+                         frame_delay=self.descriptor.ship_frame_delay, collision_frame_delay=self.descriptor.ship_collision_frame_delay,
+                         screen_height=self.setting.screen_height)
+        
+        self.all_sprites.add(self.ship)
+
+    def loading_assets(self):
+        """ Load game assets like beat map and music """
+        descriptor = self.descriptor
+        fonts_dir = os.path.join(ASSETS_DIR, "fonts")
+        self.beat_map_file_path = descriptor.track(descriptor.chart)
+        self.music_file_path = descriptor.track(descriptor.music)
+        self.ship_path = descriptor.asset(descriptor.ship_sheet)
+        self.obstacle_path = descriptor.asset(descriptor.obstacle_sheet)
+        self.hit_obstacle_path = descriptor.asset(descriptor.hit_obstacle_sheet)
+        self.background_path = descriptor.asset(descriptor.background_sheet)
+
+        self.streak_font_path = os.path.join(fonts_dir, "DynaPuff-Bold.ttf")
+        self.unstreak_font_path = os.path.join(fonts_dir, "DynaPuff-Regular.ttf")
+
+        for name, file_name in descriptor.sounds.items():
+            self.sound_manager.load_sound(name, descriptor.asset(file_name))
+
+    def set_fonts(self):
+
+        """ Initialize game fonts """
+        self.hit_state_font = pygame.font.Font(self.unstreak_font_path, 45)
+        self.streak_state_font = pygame.font.Font(self.streak_font_path, 45)
+    def create_background(self):
+        """ Build the background once, replays reuse it. Yields between loading phases """
+        self.background = yield from LevelBackground.loader(self.setting.screen_width, self.setting.screen_height, self.descriptor, self.setting.weather_density)
+
+    def reset_states(self):
+        
+        """ Reset game state variables """
+        self.start_time = self.time_source()
+        self.collided = False
+        self.hit = False
+        self.missed = False
+        self.new_text = ""
+        self.last_text_time = 0
+        self.last_frame_time = 0
+        self.music_play_time = 0
+        self.total_pause_time = 0
+        self.pause = False
+        self.end_game = False
+    
+    def reset_score(self):
+        """ Initialize and reset scoring system """
+        self.note_table, self.max_score = beat_processing(self.beat_map_file_path)
+        self.beats_list = self.note_table.notes
+        # Spawn lead time is the time a note needs to travel from the right edge to the ship
+        travel_distance = self.setting.screen_width - self.setting.screen_width / 8 - self.ship_screen_width
+        self.scheduler = NoteScheduler(self.note_table, travel_distance / self.obstacle_speed, travel_distance / self.guideline_speed)
+        self.score = 0
+        self.perfect = 0
+        self.misses = 0
+        self.single_score = 10
+        self.long_score = 1
+        self.judge = JudgementEngine(self.note_table, self.setting.grace_period, self.single_score, self.long_score, **self.descriptor.judge_options)
+        self.streak = 0
+        self.first_star_mark = int(self.max_score*3/10)
+        self.second_star_mark = int(self.max_score*6/10)
+        self.third_star_mark = int(self.max_score*9/10)
+        self.first_star_check = False
+        self.second_star_check = False
+        self.third_star_check = False
+
+    def prepare_guidelines(self):
+        """
+        Build the gradients of every guideline size now so guidelines spawning
+        mid-song find them cached. Yields after every size.
+        """
+        long_notes = ~self.note_table.single
+        guideline_widths = (self.guideline_speed * (self.note_table.end[long_notes] - self.note_table.start[long_notes])).astype(int)
+        # A set rather than np.unique, which imports numpy.ma on first use
+        for width in sorted(set(guideline_widths.tolist())):
+            Guideline.gradients(pygame.Rect(0, 0, width, 20))
+            yield
+
+    def on_enter(self):
+        """ Prepare the game when entering the level """
+        self.screen.fill("black")
+        self.obstacles_group.empty()
+        self.guidelines_group.empty()
+        self.reset_states()
+        self.reset_score()
+        # Sizes evicted from the gradient cache since the last play are built again
+        for _ in self.prepare_guidelines():
+            pass
+        self.ship.reset()
+        self.sound_manager.load_music(self.music_file_path)
+        self.sound_manager.play_music(0)
+        
+    def on_pause(self):
+        self.pause_timestamp = self.time_source() 
+        self.sound_manager.pause_music()
+
+    def on_resume(self):
+        self.pause = False
+        self.on_resume_timestamp = self.time_source()
+        pygame.mixer.music.unpause()
+        self.total_pause_time += self.on_resume_timestamp - self.pause_timestamp
+
+    def spawn_obstacle(self, current_time):
+        """ Spawn obstacles or guidelines whose scheduled spawn time has been reached """
+        for note in self.scheduler.due(current_time):
+            if note.type == "single":
+                # Create and add a single obstacle, in the level's single lane if it has one
+                obstacle = self.obstacles_group.spawn(note, self.setting.screen_width, self.lane_y(self.descriptor.single_lane or note.placement))
+                self.judge.add_obstacle(obstacle)
+            else:
+                # Create and add a guideline
+                guideline = Guideline(
+                    x=self.setting.screen_width,
+                    guideline_y=self.lane_y(note.placement),
+                    width=int(self.guideline_speed * note.duration),
+                    height=20,
+                    note=note,
+                    unaligned_alpha=self.descriptor.guideline_alpha
+                )
+                self.guidelines_group.add(guideline)
+                self.judge.add_guideline(guideline)
+
+    def lane_y(self, placement):
+        """ Centre y of the lane a note placement refers to, the middle by default """
+        if placement == 'up':
+            return self.setting.screen_height / 2 - self.setting.screen_height / 4
+        if placement == 'down':
+            return self.setting.screen_height / 2 + self.setting.screen_height / 4
+        return self.setting.screen_height / 2
+
+    def update_score(self, current_time, dt):
+        """ Update game score based on note timings, player actions, and streak tracking """
+        lanes = held_lanes(self.ship.up_pressed, self.ship.down_pressed)
+        with profiler.scope("judgement"):
+            collided = self.judge.update(current_time, dt, lanes, self.ship.trigger_pressed)
+        if collided is not None:
+            self.ship.collided = collided
+        self.score = self.judge.score
+        self.perfect = self.judge.perfect
+        self.misses = self.judge.misses
+        self.streak = self.judge.streak
+
+        # Update star checks
+        if self.score >= self.first_star_mark:
+            self.first_star_check = True
+        if self.score >= self.second_star_mark:
+            self.second_star_check = True
+        if self.score >= self.third_star_mark:
+            self.third_star_check = True
+
+    def read_input(self):
+        """ Return the (up, down, trigger) input state from the keyboard and the detection results """
+        with profiler.scope("detection"):
+            keys = pygame.key.get_pressed()
+            detection = self.detection_result
+            if self.descriptor.two_handed:
+                up = detection["left_hand_up"] and detection["right_hand_up"]
+                down = detection["left_hand_down"] and detection["right_hand_down"]
+            else:
+                up = detection["left_hand_up"]
+                down = detection["left_hand_down"]
+            return (keys[pygame.K_UP] or up,
+                    keys[pygame.K_DOWN] or down,
+                    keys[pygame.K_SPACE] or detection["clapped"])
+
+    def update_ships(self, dt):
+        """ Handle ship movements based on key inputs """
+        up_pressed, down_pressed, trigger_pressed = self.read_input()
+        self.ship.move(dt, up_pressed=up_pressed, down_pressed=down_pressed, trigger_pressed=trigger_pressed)
+        self.ship.update(dt)
+
+    def update_obstacles(self, dt):
+        """ Move obstacles and remove those no longer on screen """
+
+        for guideline in list(self.guidelines_group):
+            guideline.move(self.guideline_speed, dt)
+            # Remove guidelines off screen
+            if guideline.rect.right < 0:
+                self.guidelines_group.remove(guideline)
+        
+        # Move obstacles and remove the judged ones that are off screen
+        self.obstacles_group.scroll(self.obstacle_speed, dt)
+        self.guidelines_group.update()
+        self.obstacles_group.update(dt)
+
+    def check_guideline_alignment(self, current_time):
+        """ Check if ships are touching obstacle guidelines """
+        lanes = held_lanes(self.ship.up_pressed, self.ship.down_pressed)
+        for guideline in self.guidelines_group:
+            # The ship is aligned when it holds the guideline's lane
+            if lanes >> guideline.note.lane & 1:
+                if guideline.note.time_start <= current_time <= guideline.note.time_end:
+                    guideline.collided()
+                else:
+                    guideline.align()
+            else:
+                guideline.unalign()
+
+    def draw(self):
+        """ Render game screen and elements """
+        self.screen.fill(self.WHITE)
+        with profiler.scope("background"):
+            self.background.draw(self.screen, 0)
+        
+
+        # Draw score line
+        score_width = int(self.score_line_length * (self.score / self.max_score))
+        pygame.draw.rect(self.screen, (214, 171, 245), (self.setting.screen_width/2 - self.score_line_length/2, 35, self.score_line_length, self.score_line_width), 0, 50)
+        if  self.streak > 5:
+            streak_color = (245, 66, 102)
+            streak_font, streak_text = self.streak_state_font, f"X {self.streak}"
+        else:
+            streak_color = (90, 45, 116)
+            streak_font, streak_text = self.hit_state_font, f"x {self.streak}"
+        pygame.draw.rect(self.screen, streak_color, (self.setting.screen_width/2 - self.score_line_length/2, 35, score_width, self.score_line_width), 0, 50)
+        with profiler.scope("text"):
+            # The streak changes every few frames, compose it from cached glyphs
+            text_cache.draw_glyphs(self.screen, streak_font, streak_text, streak_color,
+                                   (self.setting.screen_width/2 - self.score_line_length/2 - self.setting.screen_width/16, 13))
+        # Draw star markers
+        star_positions = [
+            (self.first_star_mark, self.first_star_check),
+            (self.second_star_mark, self.second_star_check),
+            (self.third_star_mark, self.third_star_check)
+        ]
+        
+        for mark, checked in star_positions:
+            x_pos = self.setting.screen_width/2 - self.score_line_length/2 + int(self.score_line_length * (mark / self.max_score))
+            color = (152, 56, 181) if checked else (255, 165, 0)
+            pygame.draw.circle(self.screen, color, (x_pos, self.score_line_width/2 + 35), 10)
+
+        with profiler.scope("blits"):
+            # Draw sprites in specific groups with custom rendering if needed
+            for sprite in self.guidelines_group:
+                self.screen.blit(sprite.image, sprite.rect)
+        
+            self.obstacles_group.draw(self.screen)
+
+        
+            trailing_x = 0
+            trailing_y = self.ship.rect.y + (self.ship.rect.height - self.ship.current_trailing.height) // 2
+            self.ship.current_trailing.draw(self.screen, trailing_x, trailing_y)
+
+            # Guidelines are drawn above and never join all_sprites, so a soft reset only has to empty their group
+            for sprite in self.all_sprites:
+                self.screen.blit(sprite.image, sprite.rect)
+
+    def environment_update(self, dt):
+        self.background.update(dt)
+
+    def update(self):
+        """ Main update function for each frame """
+        
+        current_time = self.time_source() - self.start_time - self.total_pause_time
+        dt = current_time - self.last_frame_time
+        self.spawn_obstacle(current_time)
+        self.update_score(current_time, dt)
+        self.environment_update(dt)
+        self.update_obstacles(dt)
+        self.update_ships(dt)
+        self.check_guideline_alignment(current_time)
+        # Update all sprites
+        
+        self.last_frame_time = current_time
+       
+    def song_finished(self):
+        """ True once the last note has been spawned and its end has passed """
+        return self.beats_list[-1].spawned and self.time_source() - self.start_time -self.total_pause_time > self.beats_list[-1].time_end > 2
+
+    def handle_events(self, event, detection_results, lock):
+        """ Handle game events and state transitions """
+
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.pause = True
+        else:
+            if detection_results["cross_arm"]:
+                self.pause = True
+        self.detection_result = detection_results
+        # Check for game over condition
+        if self.song_finished():
+            self.end_game = True
+        if self.end_game:
+            update_score(self.descriptor.level_id, self.score, self.misses, self.perfect, self.first_star_check, self.second_star_check, self.third_star_check)
+            return "game_over"
+        if self.pause:
+            self.on_pause()
+            return "pause"
+
+    def on_out(self):
+        """ Cleanup method when leaving the level """
+        pygame.mixer.music.stop()
+
+def run(level_class):
+    """ Play a level on its own, without the menus """
+    pygame.init()
+    setting = SettingsManager()
+    screen = pygame.display.set_mode((setting.screen_width, setting.screen_height), vsync= 1)
+    pygame.display.set_caption("ship Game")
+    clock = pygame.time.Clock()
+    # Initialize Gameplay
+    game = level_class(setting, screen, clock)
+
+    running = True
+    game.on_enter()
+    
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        game.update()
+        game.draw()
+        pygame.display.flip()
+        clock.tick(120)
+    pygame.quit()
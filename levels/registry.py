@@ -0,0 +1,56 @@
+import os, sys, json, importlib
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(parent_dir)
+
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "manifest.json")
+
+
+class LevelRegistry:
+    """
+    Level ids mapped to their gameplay classes, imported on first use.
+
+    The ids and "module:Class" targets come from levels/manifest.json, so
+    knowing which levels exist costs a small JSON read and no imports. A
+    level's module (and the gameplay engine behind it) is only imported the
+    first time level_class() is asked for it. register() adds levels that
+    are not in the manifest, e.g. from a plugin.
+    """
+    def __init__(self, manifest_path=MANIFEST_PATH):
+        self.targets = {}  # level id -> "module:Class"
+        self.classes = {}  # level id -> imported class
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as file:
+                self.targets.update(json.load(file))
+
+    def register(self, level_id, target):
+        """ Add a level, target is a "module:Class" string or the class itself """
+        if isinstance(target, str):
+            self.targets[level_id] = target
+            self.classes.pop(level_id, None)
+        else:
+            self.targets[level_id] = f"{target.__module__}:{target.__qualname__}"
+            self.classes[level_id] = target
+
+    def __contains__(self, level_id):
+        return level_id in self.targets
+
+    def __iter__(self):
+        return iter(self.targets)
+
+    def level_class(self, level_id):
+        """ The gameplay class of a level id, importing its module the first time; None for unknown ids """
+        level = self.classes.get(level_id)
+        if level is None and level_id in self.targets:
+            module_name, class_name = self.targets[level_id].split(":")
+            level = self.classes[level_id] = getattr(importlib.import_module(module_name), class_name)
+        return level
+
+
+# Shared by the scene manager and the tools that run levels
+levels = LevelRegistry()
+
+
+def level_class(level_id):
+    """ The gameplay class of a level id, or None when there is no such level """
+    return levels.level_class(level_id)
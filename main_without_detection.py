@@ -1,3 +1,4 @@
+from resources.startup import startup  # First, so the imports below are timed when it records
 import pygame, sys
 from UI.TitleScreen import TitleScreen
 from UI.LevelChooser import LevelChooserScreen
@@ -6,25 +7,31 @@ from UI.PauseScreen import PauseScreen
 from Settings.SceneManager import SceneManager
 from Settings.settings import SettingsManager
 from Settings.SettingsScreen import SettingsScreen
+from resources.profiler import profiler
 
 def game_init(settings_object, detection_results, lock):
     # con = pygame.image.load("logo.png")
     # pygame.display.set_icon(icon)
-    screen = pygame.display.set_mode(
-        (settings_object.screen_width, settings_object.screen_height),
-        pygame.FULLSCREEN if settings_object.full_screen else 0, 
-        0, 
-        0, 
-        settings_object.vsync
-    )
+    with startup.span("display", "set_mode"):
+        screen = pygame.display.set_mode(
+            (settings_object.screen_width, settings_object.screen_height),
+            pygame.FULLSCREEN if settings_object.full_screen else 0, 
+            0, 
+            0, 
+            settings_object.vsync
+        )
     pygame.display.set_caption("Harmonic Horizons")
     clock = pygame.time.Clock()
     scene_manager = SceneManager(settings_object, screen, clock)
-    scene_manager.add_scene("title", TitleScreen(settings_object, screen))
-    scene_manager.add_scene("settings", SettingsScreen(settings_object, screen))
-    scene_manager.add_scene("level_chooser", LevelChooserScreen(settings_object, screen))
-    scene_manager.add_scene("pause", PauseScreen(settings_object, screen))
-    scene_manager.add_scene("game_over", EndScreen(settings_object, screen))
+    with startup.span("scene", "title"):
+        scene_manager.add_scene("title", TitleScreen(settings_object, screen))
+    # The other screens are built the first time they are shown
+    scene_manager.add_scene("settings", SettingsScreen)
+    scene_manager.add_scene("level_chooser", LevelChooserScreen)
+    scene_manager.add_scene("pause", PauseScreen)
+    scene_manager.add_scene("game_over", EndScreen)
+    # The level chooser is almost always next, build it while the title idles
+    scene_manager.prewarm("level_chooser")
     # Set the initial scene
     scene_manager.change_scene("title")
     running = True
@@ -36,13 +43,20 @@ def game_init(settings_object, detection_results, lock):
             scene_manager.handle_events(event, detection_results, lock)
         scene_manager.update()
         scene_manager.draw()
-        pygame.display.flip()
+        dirty_rects = scene_manager.dirty_rects()
+        if dirty_rects is None:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+        if startup.first_frame_time is None and startup.first_frame():
+            running = False
         clock.tick(settings_object.fps)  # Fixed here
+    profiler.dump_csv()
     pygame.quit()
     sys.exit()
 
 
-if __name__ == '__main__':
+def main():
     pygame.init()
     setting = SettingsManager()
     
@@ -56,4 +70,8 @@ if __name__ == '__main__':
                 "cross_arm": False,
                 "ended": False
             }
-    game_init(setting, detection_result, None)
\ No newline at end of file
+    game_init(setting, detection_result, None)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,8 +2,13 @@ import pygame
 import colorsys
 import math
 import random, datetime, json
+import numpy as np
 from Settings.settings import SettingsManager
-from resources.environment import Raindrop, Snow, Stars
+from resources.environment import Precipitation
+from resources.textcache import text_cache
+from resources.overlays import overlays
+from resources.gradients import gradient_cache, linear_rows, rainbow_rows, apply_rounded_mask, rows_to_surface, iter_rows_to_surface
+from resources.sceneloader import run_steps
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -89,10 +94,7 @@ class LightningFlash:
     def draw(self, screen):
         """Draw the lightning flash on the screen"""
         if self.flash_alpha > 0:
-            flash_surface = pygame.Surface((self.screen_width, self.screen_height))
-            flash_surface.fill((255, 255, 255))  # White flash
-            flash_surface.set_alpha(self.flash_alpha)
-            screen.blit(flash_surface, (0, 0))
+            overlays.fill(screen, (255, 255, 255), self.flash_alpha, (0, 0, self.screen_width, self.screen_height))  # White flash
 
 class ScreenDimming:
     def __init__(self, screen_width, screen_height):
@@ -112,10 +114,7 @@ class ScreenDimming:
 
     def draw(self, screen):
         """Draw the dimming effect on the screen"""
-        dim_surface = pygame.Surface((self.screen_width, self.screen_height))
-        dim_surface.fill((0, 0, 0))  # Black dim
-        dim_surface.set_alpha(self.dim_alpha)
-        screen.blit(dim_surface, (0, 0))
+        overlays.fill(screen, (0, 0, 0), self.dim_alpha, (0, 0, self.screen_width, self.screen_height))  # Black dim
 
 
 
@@ -174,42 +173,23 @@ def create_horizontal_gradient_surface(rect, top_color, bottom_color, border_rad
     Returns:
         pygame.Surface: A surface with the gradient and rounded corners applied.
     """
-    # Scale up for subpixel blending
-    upscale_factor = 4  # Draw at 4x resolution for smoother gradient
-    gradient_height = rect.height * upscale_factor
-    gradient_surface = pygame.Surface((rect.width, gradient_height), pygame.SRCALPHA)
-
-    for i in range(gradient_height):
-        # Calculate normalized position (0.0 to 1.0)
-        factor = i / gradient_height
-
-        # Gamma correction for perceptual smoothing
-        corrected_factor = math.pow(factor, 2.2)  # Gamma = 2.2 for perceptual linearity
-
-        # Interpolate colors with gamma correction
-        current_color = (
-            int(top_color[0] + (bottom_color[0] - top_color[0]) * corrected_factor),
-            int(top_color[1] + (bottom_color[1] - top_color[1]) * corrected_factor),
-            int(top_color[2] + (bottom_color[2] - top_color[2]) * corrected_factor),
-            255  # Alpha channel
-        )
-
-        # Draw a single line for the current gradient step
-        pygame.draw.line(gradient_surface, current_color, (0, i), (rect.width, i))
+    return run_steps(iter_horizontal_gradient_surface(rect, top_color, bottom_color, border_radius))
 
-    # Downscale to original size for smoother appearance
-    gradient_surface = pygame.transform.smoothscale(gradient_surface, (rect.width, rect.height))
 
-    # Create a rounded mask
-    mask_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-    pygame.draw.rect(mask_surface, (255, 255, 255, 255), 
-                     (0, 0, rect.width, rect.height), 
-                     border_radius=border_radius)
+def iter_horizontal_gradient_surface(rect, top_color, bottom_color, border_radius=0):
+    """ create_horizontal_gradient_surface as a generator for scene loaders, yields between bands of rows """
+    def build_steps():
+        # Rows are computed at 4x resolution and averaged down for a smoother gradient,
+        # with gamma 2.2 for perceptual linearity
+        gradient_surface = yield from iter_rows_to_surface(linear_rows(top_color, bottom_color, rect.height, gamma=2.2, supersample=4), rect.width)
+        # Rounded corners only when needed
+        if border_radius > 0:
+            yield
+            apply_rounded_mask(gradient_surface, border_radius)
+        return gradient_surface
 
-    # Apply the rounded mask to the gradient surface
-    gradient_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-
-    return gradient_surface
+    key = ("horizontal", (rect.width, rect.height), tuple(top_color), tuple(bottom_color), border_radius)
+    return (yield from gradient_cache.iter_get(key, build_steps))
 
 
 def create_smooth_rainbow_gradient(rect, border_radius = 0):
@@ -223,30 +203,8 @@ def create_smooth_rainbow_gradient(rect, border_radius = 0):
     Returns:
         pygame.Surface: A surface with the rainbow gradient and rounded corners applied.
     """
-    gradient_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-
-    for i in range(rect.height):
-        # Calculate the normalized position (0.0 to 1.0)
-        factor = 1 - (i / rect.height)
-
-        # Generate the color in the rainbow (Hue: 0 to 1, Saturation: 1, Lightness: 0.5)
-        hue = factor  # Hue cycles from 0 (red) to 1 (back to red via rainbow colors)
-        r, g, b = colorsys.hsv_to_rgb(hue, 1, 1)  # Full saturation and brightness
-        current_color = (int(r * 255), int(g * 255), int(b * 255))
-
-        # Draw the current line
-        pygame.draw.line(gradient_surface, current_color, (0, i), (rect.width, i))
-
-    # Create a rounded mask
-    mask_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-    pygame.draw.rect(mask_surface, (255, 255, 255, 255), 
-                     (0, 0, rect.width, rect.height), 
-                     border_radius=border_radius)
-
-    # Apply the rounded mask to the gradient surface
-    gradient_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-
-    return gradient_surface
+    key = ("rainbow", (rect.width, rect.height), border_radius)
+    return gradient_cache.get(key, lambda: apply_rounded_mask(rows_to_surface(rainbow_rows(rect.height), rect.width), border_radius))
 
 def create_vertical_gradient_surface(rect, top_color, bottom_color, border_radius=0):
     """
@@ -261,41 +219,20 @@ def create_vertical_gradient_surface(rect, top_color, bottom_color, border_radiu
     Returns:
         pygame.Surface: A surface with the gradient and rounded corners applied.
     """
-    # Create a surface for the gradient with transparency
-    gradient_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-
-    # Loop through each pixel row to create the gradient
-    for y in range(rect.height):
-        # Interpolation factor for the gradient (normalized)
-        factor = y / rect.height
-
-        # Interpolate colors
-        current_color = (
-            int(top_color[0] + (bottom_color[0] - top_color[0]) * factor),
-            int(top_color[1] + (bottom_color[1] - top_color[1]) * factor),
-            int(top_color[2] + (bottom_color[2] - top_color[2]) * factor),
-            255  # Full alpha channel
-        )
+    def build():
+        gradient_surface = rows_to_surface(linear_rows(top_color, bottom_color, rect.height), rect.width)
+        # Rounded corners only when needed
+        if border_radius > 0:
+            apply_rounded_mask(gradient_surface, border_radius, pygame.BLEND_RGBA_MIN)
+        return gradient_surface
 
-        # Draw a horizontal line at the current row
-        pygame.draw.line(gradient_surface, current_color, (0, y), (rect.width, y))
-
-    # Create a mask for rounded corners if needed
-    if border_radius > 0:
-        # Create a surface to serve as a mask
-        mask_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        # Draw a rounded rectangle on the mask
-        pygame.draw.rect(
-            mask_surface, (255, 255, 255, 255),
-            (0, 0, rect.width, rect.height),
-            border_radius=border_radius
-        )
-        # Apply the mask to the gradient surface
-        gradient_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-
-    return gradient_surface
+    key = ("vertical", (rect.width, rect.height), tuple(top_color), tuple(bottom_color), border_radius)
+    return gradient_cache.get(key, build)
 
 class Button:
+    pulse_amplitude = 0.05
+    pulse_steps = 11  # Quantized scales between 1 - pulse_amplitude and 1 + pulse_amplitude
+
     def __init__(self, x, y, width, height, text, border_radius):
         self.base_rect = pygame.Rect(x, y, width, height)  # Original dimensions
         self.rect = self.base_rect.copy()  # Current pulsating dimensions
@@ -312,6 +249,26 @@ class Button:
             self.base_rect, HOVER_TOP, HOVER_BOTTOM, border_radius
         )
 
+        # Pre-scale every pulse step, with the border drawn in, so drawing is a blit
+        self.pulse_sizes = []
+        for step in range(Button.pulse_steps):
+            scale_factor = 1 - Button.pulse_amplitude + 2 * Button.pulse_amplitude * step / (Button.pulse_steps - 1)
+            self.pulse_sizes.append((int(self.base_rect.width * scale_factor), int(self.base_rect.height * scale_factor)))
+        self.hover_frames = [self.build_frame(self.hover_gradient_surface, size, hover_border_color, HOVER_TOP, HOVER_BOTTOM)
+                             for size in self.pulse_sizes]
+        self.normal_frame = self.build_frame(self.normal_gradient_surface, self.base_rect.size, normal_border_color, NORMAL_TOP, NORMAL_BOTTOM)
+        self.current_frame = self.normal_frame
+
+    def build_frame(self, gradient_surface, size, border_color, top_color, bottom_color):
+        """ Gradient scaled to size with the border drawn in, shared by every button of the same look """
+        def build():
+            frame = pygame.transform.smoothscale(gradient_surface, size)
+            # Opaque like the border drawn straight onto the screen used to be
+            pygame.draw.rect(frame, pygame.Color(border_color)[:3], frame.get_rect(), 2, border_radius=self.border_radius)
+            return frame
+        key = ("button", self.base_rect.size, size, top_color, bottom_color, border_color, self.border_radius)
+        return gradient_cache.get(key, build)
+
     def update(self, delta_time):
         """
         Update the button's state, including hover detection and animations.
@@ -323,11 +280,10 @@ class Button:
         if self.is_hovered:
             # Increment pulse time for animation
             self.pulse_time += delta_time
-            # Calculate scaling factor for pulsation
-            scale_factor = 1 + 0.05 * math.sin(self.pulse_time * 4)
-            # Adjust the rect size based on the scale factor
-            new_width = int(self.base_rect.width * scale_factor)
-            new_height = int(self.base_rect.height * scale_factor)
+            # Pick the pre-scaled step closest to the pulse
+            step = round((math.sin(self.pulse_time * 4) + 1) / 2 * (Button.pulse_steps - 1))
+            new_width, new_height = self.pulse_sizes[step]
+            self.current_frame = self.hover_frames[step]
             self.rect = pygame.Rect(
                 self.base_rect.centerx - new_width // 2,
                 self.base_rect.centery - new_height // 2,
@@ -337,6 +293,7 @@ class Button:
         else:
             # Reset to base size and reset pulse time
             self.rect = self.base_rect.copy()
+            self.current_frame = self.normal_frame
             self.pulse_time = 0
 
     def draw(self, screen, font):
@@ -347,34 +304,35 @@ class Button:
             screen (pygame.Surface): The surface to draw on.
             font (pygame.font.Font): The font used to render the button text.
         """
-        # Choose the correct gradient surface
-        if self.is_hovered:
-            gradient_surface = pygame.transform.smoothscale(
-                self.hover_gradient_surface, (self.rect.width, self.rect.height)
-            )
-            border_color = hover_border_color
-            text_color = hover_text_color
-        else:
-            gradient_surface = pygame.transform.smoothscale(
-                self.normal_gradient_surface, (self.rect.width, self.rect.height)
-            )
-            border_color = normal_border_color
-            text_color = unhover_text_color
-
-        # Draw the gradient surface
-        screen.blit(gradient_surface, self.rect.topleft)
+        text_color = hover_text_color if self.is_hovered else unhover_text_color
+        frame = self.current_frame
+        if self.is_hovered != (frame is not self.normal_frame):
+            # Hover changed since the last update, draw the matching resting frame
+            frame = self.hover_frames[Button.pulse_steps // 2] if self.is_hovered else self.normal_frame
 
-        # Draw the border
-        pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=self.border_radius)
+        # Draw the gradient and border at the current pulse size
+        screen.blit(frame, frame.get_rect(center=self.rect.center))
 
         # Draw the text
-        text_surface = font.render(self.text, True, text_color)
+        text_surface = text_cache.render(font, self.text, text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
 
 class Background(pygame.sprite.Sprite):
     def __init__(self, screen_width, screen_height, state_of_time, weather = None, bottom_gradient = None, top_gradient = None):
+        for _ in self.load(screen_width, screen_height, state_of_time, weather, bottom_gradient, top_gradient):
+            pass
+
+    @classmethod
+    def loader(cls, *args, **kwargs):
+        """ Build the background a loading phase at a time for a SceneLoader, returns the background """
+        background = cls.__new__(cls)
+        yield from background.load(*args, **kwargs)
+        return background
+
+    def load(self, screen_width, screen_height, state_of_time, weather = None, bottom_gradient = None, top_gradient = None):
+        """ Constructor body, yields between loading phases so a scene loader can spread it over frames """
         super().__init__()
         self.width = screen_width
         self.height = screen_height  # Half the screen height
@@ -391,11 +349,16 @@ class Background(pygame.sprite.Sprite):
         else:
             top_color = (220,240,250)
             bottom_color = (185,226,245)
-        self.image.blit(create_horizontal_gradient_surface(self.image.get_rect(),top_color,bottom_color))
+        self.top_color = top_color
+        self.bottom_color = bottom_color
+        yield
+        self.image.blit((yield from iter_horizontal_gradient_surface(self.image.get_rect(),top_color,bottom_color)))
+        yield
+        yield from self.iter_bake_static_layer()
         # Create stars randomly in the background
-        self.stars_group = pygame.sprite.Group()
-        self.rain_group = pygame.sprite.Group()
-        self.snow_group = pygame.sprite.Group()
+        self.stars = Precipitation(self.width, self.height, axis=0, direction=-1, rounding=np.ceil)
+        self.rain = Precipitation(self.width, self.height, rounding=np.trunc)
+        self.snow = Precipitation(self.width, self.height)
         if state_of_time == 'night':
             self.direction = -1
             self.create_stars()
@@ -406,52 +369,101 @@ class Background(pygame.sprite.Sprite):
 
     def create_raindrops(self, num_drops = 200):
         """Generate a list of raindrops."""
-        for _ in range(num_drops):
-            x = random.randint(0, self.width)
-            y = random.randint(-self.height, 0)
-            speed = random.uniform(800, 825)  # Pixels per second
-            length = random.randint(5, 15)   # Length of the raindrop
-            raindrop = Raindrop(x, y, speed, length)
-            self.rain_group.add(raindrop)
+        images = {}
+        for length in range(5, 16):  # Length of the raindrop
+            images[length] = pygame.Surface((2, length), pygame.SRCALPHA)  # Transparent surface
+            pygame.draw.line(images[length], (135, 206, 250), (0, 0), (0, length), 2)
+        lengths = np.random.randint(5, 16, num_drops)
+        positions = np.column_stack((np.random.randint(0, self.width + 1, num_drops),
+                                     np.random.randint(-self.height, 1, num_drops)))
+        speeds = np.random.uniform(800, 825, num_drops)  # Pixels per second
+        self.rain.add([images[length] for length in lengths.tolist()], positions, speeds)
 
     def create_snow(self, num_drops = 500):
-        """Generate a list of raindrops."""
-        for _ in range(num_drops):
-            x = random.randint(0, self.width)
-            y = random.randint(-self.height, self.height)
-            speed = random.uniform(200, 250)  # Pixels per second
-            length = random.choice([2,4,6])   # Length of the raindrop
-            snowdrop = Snow(x, y, speed, length)
-            self.snow_group.add(snowdrop)
+        """Generate a list of snowflakes."""
+        images = {}
+        for length in [2, 4, 6]:
+            images[length] = pygame.Surface((length, length), pygame.SRCALPHA)  # Transparent surface
+            pygame.draw.line(images[length], (255, 255, 255), (length//2, 0), (length//2, length), 1)
+            pygame.draw.line(images[length], (255, 255, 255), (0, length//2), (length, length//2), 1)
+        lengths = np.random.choice([2, 4, 6], num_drops)
+        positions = np.column_stack((np.random.randint(0, self.width + 1, num_drops),
+                                     np.random.randint(-self.height, self.height + 1, num_drops)))
+        speeds = np.random.uniform(200, 250, num_drops)  # Pixels per second
+        self.snow.add([images[length] for length in lengths.tolist()], positions, speeds)
     
     def create_stars(self, num_stars=100):
         """Create random stars (circles) inside the background."""
-        for _ in range(num_stars):
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height)
-            star = Stars(x, y, self.direction)
-            self.stars_group.add(star)
+        radius = 1
+        star_image = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        pygame.draw.circle(star_image, (255, 255, 255), (radius, radius), radius)  # Draw a white circle (star)
+        positions = np.column_stack((np.random.randint(0, self.width + 1, num_stars),
+                                     np.random.randint(0, self.height + 1, num_stars))) - radius
+        self.stars.add([star_image] * num_stars, positions, np.random.randint(1, 4, num_stars))
         
     def update(self, dt):
         """Update the stars if needed (e.g., for movement or animation)."""
-        self.stars_group.update(self.width, dt)
-        self.rain_group.update(self.height, dt)
-        self.snow_group.update(self.height, dt)
+        self.stars.update(dt)
+        self.rain.update(dt)
+        self.snow.update(dt)
+
+    def bake_static_layer(self):
+        """Pre-render the parts that never move (gradient and moon) and allocate the back buffer."""
+        for _ in self.iter_bake_static_layer():
+            pass
+
+    def iter_bake_static_layer(self):
+        """bake_static_layer as a generator, yields after each full-size surface it makes."""
+        self.static_layer = self.image.copy()
+        if self.state_of_time == 'night':
+            self.static_layer.blit(self.moon_surface, (150,50))
+        yield
+        self.back_buffer = pygame.Surface((self.width, self.height))
+        self.saved_clip = None
+        yield
+
+    def resize(self, screen_width, screen_height):
+        """Rebuild the gradient and the static layer, and spread the stars, rain and snow over the new resolution."""
+        self.width = screen_width
+        self.height = screen_height
+        self.image = pygame.Surface((self.width, self.height))
+        self.image.blit(create_horizontal_gradient_surface(self.image.get_rect(), self.top_color, self.bottom_color))
+        self.bake_static_layer()
+        for field in (self.stars, self.rain, self.snow):
+            field.resize(self.width, self.height)
+
+    def begin_frame(self, surface, y_pos):
+        """
+        Start composing a frame and return the surface to draw the moving parts on.
+
+        When the background sits at the top of the target it is composed
+        straight onto the target, clipped to the background's area; otherwise
+        it is composed on the persistent back buffer, which end_frame() blits.
+        """
+        if y_pos == 0:
+            self.saved_clip = surface.get_clip()
+            surface.set_clip(self.saved_clip.clip(self.static_layer.get_rect()))
+            surface.blit(self.static_layer, (0, 0))
+            return surface
+        self.back_buffer.blit(self.static_layer, (0, 0))
+        return self.back_buffer
+
+    def end_frame(self, surface, y_pos):
+        if y_pos == 0:
+            surface.set_clip(self.saved_clip)
+        else:
+            surface.blit(self.back_buffer, (0, y_pos))
 
     def draw(self, surface, y_pos):
         """Draw the background and the stars to the given surface."""
-        background_surface = pygame.Surface((self.width, self.height))
-        background_surface.blit(self.image)
-        if self.state_of_time == 'night':
-            background_surface.blit(self.moon_surface, (150,50))
+        canvas = self.begin_frame(surface, y_pos)
         if self.weather == 'rain':
-            self.rain_group.draw(background_surface)
+            self.rain.draw(canvas)
         elif self.weather == 'snow':
-            self.snow_group.draw(background_surface)
+            self.snow.draw(canvas)
         elif self.weather == "star":
-            self.stars_group.draw(background_surface)
-            
-        surface.blit(background_surface, (0, y_pos))
+            self.stars.draw(canvas)
+        self.end_frame(surface, y_pos)
          
 
 # Planet class definition
@@ -489,6 +501,26 @@ class LevelBlock:
             self.base_rect, HOVER_TOP, HOVER_BOTTOM, border_radius
         )
 
+        # One animation step per pixel between the default and selected sizes, pre-scaled in both colors
+        self.steps = max(abs(int(selected_width) - int(default_width)), abs(int(selected_height) - int(default_height))) + 1
+        self.step = 0
+        self.normal_frames = []
+        self.selected_frames = []
+        for step in range(self.steps):
+            size = self.size_at(step / max(self.steps - 1, 1))
+            self.normal_frames.append(self.build_frame(self.normal_gradient_surface, size, NORMAL_TOP, NORMAL_BOTTOM))
+            self.selected_frames.append(self.build_frame(self.selected_gradient_surface, size, HOVER_TOP, HOVER_BOTTOM))
+
+    def size_at(self, t):
+        """ Size of the block t of the way from the default to the selected size """
+        width = self.default_width + t * (self.selected_width - self.default_width)
+        height = self.default_height + t * (self.selected_height - self.default_height)
+        return (int(width), int(height))
+
+    def build_frame(self, gradient_surface, size, top_color, bottom_color):
+        key = ("level_block", self.base_rect.size, size, top_color, bottom_color, self.border_radius)
+        return gradient_cache.get(key, lambda: pygame.transform.scale(gradient_surface, size))
+
     def update(self, dt):
         """Update the animation based on target properties."""
         
@@ -499,9 +531,9 @@ class LevelBlock:
                 self.animating = False
 
             t = self.ease_in_out(self.animation_progress)
-            # Interpolate width, height, and offset_x
-            self.width = self.default_width + t * (self.target_width - self.default_width)
-            self.height = self.default_height + t * (self.target_height - self.default_height)
+            # Snap to the closest pre-scaled step; unselected blocks stay at the default size
+            self.step = round(t * (self.steps - 1)) if self.selected else 0
+            self.width, self.height = self.size_at(self.step / max(self.steps - 1, 1))
             self.offset_x = t * self.target_offset_x
             
             # Update the base rect for gradient surface
@@ -530,28 +562,21 @@ class LevelBlock:
         # Calculate the current rect
         rect = pygame.Rect(self.x + self.offset_x, self.y, self.width, self.height)
         
-        # Choose the appropriate gradient surface
-        current_gradient_surface = (self.selected_gradient_surface if self.selected 
-                                    else self.normal_gradient_surface)
+        # Choose the pre-scaled gradient of the current animation step
         if self.selected:
-            current_gradient_surface = self.selected_gradient_surface
-            border_color = hover_border_color
+            current_frame = self.selected_frames[self.step]
             text_color = hover_text_color
         else:
-            current_gradient_surface = self.normal_gradient_surface
-            border_color = normal_border_color
+            current_frame = self.normal_frames[self.step]
             text_color = unhover_text_color
-        # Scale the gradient surface to match the current rect size
-        scaled_gradient = pygame.transform.scale(current_gradient_surface, (int(self.width), int(self.height)))
         
         # Blit the scaled gradient surface
-        screen.blit(scaled_gradient, rect)
+        screen.blit(current_frame, rect)
         
         # Draw the level number
-        text = font.render(self.text, True, text_color)
+        text = text_cache.render(font, self.text, text_color)
         text_rect = text.get_rect(center=rect.center)
         screen.blit(text, text_rect)
-
     @staticmethod
     def ease_in_out(t):
         """Ease-in-out function for smooth transitions."""
@@ -586,7 +611,7 @@ class Scoreboard:
             
     def draw_section(self, title, data, y_start, section_height):
         # Draw section title
-        title_text = self.font.render(title, True, (191, 50, 156))
+        title_text = text_cache.render(self.font, title, (191, 50, 156))
         title_rect = title_text.get_rect(center=(self.width // 2, y_start + 40))
         self.surface.blit(title_text, title_rect)
 
@@ -607,16 +632,16 @@ class Scoreboard:
         # Draw stats
         stats = [("Perfect", 'purple', data["perfect"]), ("Missed", 'orange', data["misses"])]
         for i, (label, color, value) in enumerate(stats):
-            stat_label = self.stat_font.render(label, True, color)
+            stat_label = text_cache.render(self.stat_font, label, color)
             stat_label_rect = stat_label.get_rect(center=(150, y_start + section_height // 2 + i * 40))
             self.surface.blit(stat_label, stat_label_rect)
 
-            stat_value = self.stat_font.render(str(value), True, color)
+            stat_value = text_cache.render(self.stat_font, str(value), color)
             stat_value_rect = stat_value.get_rect(center=(self.width - 150, y_start + section_height // 2 + i * 40))
             self.surface.blit(stat_value, stat_value_rect)
 
         # Draw timestamp
-        timestamp_text = self.stat_font.render(f"Date: {data['timestamp']}", True, (100, 100, 100))
+        timestamp_text = text_cache.render(self.stat_font, f"Date: {data['timestamp']}", (100, 100, 100))
         timestamp_rect = timestamp_text.get_rect(center=(self.width // 2, y_start + section_height - 40))
         self.surface.blit(timestamp_text, timestamp_rect)
 
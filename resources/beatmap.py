@@ -0,0 +1,328 @@
+import mmap, os, struct, sys
+import numpy as np
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(parent_dir)
+from resources.gameplay import LANE_CODES, LANE_ANY
+
+# Compiled chart layout:
+#   header: magic, format version, reserved, note count, max score,
+#           source mtime (ns) and source size the chart was compiled from
+#   records: float32 time_start, float32 time_end, uint8 type, uint8 lane
+CHART_MAGIC = b"HHBM"
+CHART_VERSION = 1
+CHART_EXTENSION = ".chart"
+HEADER = struct.Struct("<4sHHIIqq")
+RECORD = struct.Struct("<ffBB")
+
+CHART_DTYPE = np.dtype([("start", "<f4"), ("end", "<f4"), ("type", "u1"), ("lane", "u1")])
+
+TYPE_SINGLE = 0
+TYPE_LONG = 1
+TYPE_NAMES = ("single", "long")
+LANE_NAMES = {code: name for name, code in LANE_CODES.items()}
+
+# Bits of NoteTable.state
+STATE_SPAWNED = 1
+STATE_ACTIVE = 2
+STATE_CHECKED = 4
+
+# Charts already loaded by this process, keyed by source path
+_loaded_charts = {}
+
+
+def parse_beat_map(filename):
+    """
+    Parse a text beat map into (time_start, time_end, type, lane) tuples.
+
+    Two line formats are accepted:
+        <time_start> <time_end> <placement>          (level 1)
+            'U' = Up, 'D' = Down, 'M' = Middle, 'S' = Single.
+        <time_start> <time_end> <type> <placement>   (level 2 and later)
+            type 'S' = Single, 'L' = Long; placement 'U', 'D' or 'M'.
+
+    Returns:
+        tuple:
+            - records (list): One tuple per note.
+            - max_score (int): The maximum score achievable for the beat map.
+
+    Raises:
+        ValueError: If the file contains invalid lines or unknown codes.
+    """
+    placements = {"U": LANE_CODES["up"], "D": LANE_CODES["down"], "M": LANE_CODES["middle"]}
+    records = []
+    max_score = 0
+
+    with open(filename, "r") as file:
+        for line in file:
+            parts = line.strip().split()
+            if not parts:
+                continue
+            if len(parts) not in (3, 4):
+                raise ValueError(f"Invalid note format: {line.strip()}. Expected 3 or 4 parts.")
+
+            try:
+                time_start = float(parts[0])
+                time_end = float(parts[1])
+            except ValueError:
+                raise ValueError(f"Invalid timing values in line: {line.strip()}")
+            if time_end <= time_start:
+                raise ValueError(f"Invalid time range in line: {line.strip()}")
+
+            if len(parts) == 3:
+                placement_code = parts[2].upper()
+                if placement_code == "S":
+                    note_type, lane = TYPE_SINGLE, LANE_ANY
+                elif placement_code in placements:
+                    note_type, lane = TYPE_LONG, placements[placement_code]
+                else:
+                    raise ValueError(f"Unknown placement code: '{parts[2]}' in line: {line.strip()}")
+            else:
+                type_code = parts[2].upper()
+                if type_code == "S":
+                    note_type = TYPE_SINGLE
+                elif type_code == "L":
+                    note_type = TYPE_LONG
+                else:
+                    raise ValueError(f"Unknown type code: '{parts[2]}' in line: {line.strip()}")
+                placement_code = parts[3].upper()
+                if placement_code not in placements:
+                    raise ValueError(f"Unknown placement code: '{parts[3]}' in line: {line.strip()}")
+                lane = placements[placement_code]
+
+            # Score contribution is computed from the text values, before float32 rounding
+            if note_type == TYPE_SINGLE:
+                max_score += 10  # Fixed score for single notes
+            else:
+                max_score += max(1, int((time_end - time_start) // 0.1))  # Duration-based scoring
+
+            records.append((time_start, time_end, note_type, lane))
+
+    return records, max_score
+
+
+def chart_path_for(source_path):
+    """Return the path of the compiled chart kept next to a text beat map."""
+    return os.path.splitext(source_path)[0] + CHART_EXTENSION
+
+
+def build_chart_bytes(source_path):
+    """Parse a text beat map and return its compiled chart as bytes."""
+    records, max_score = parse_beat_map(source_path)
+    stat = os.stat(source_path)
+    data = bytearray(HEADER.pack(CHART_MAGIC, CHART_VERSION, 0, len(records), max_score, stat.st_mtime_ns, stat.st_size))
+    for record in records:
+        data += RECORD.pack(*record)
+    return bytes(data)
+
+
+def compile_beat_map(source_path, chart_path=None):
+    """
+    Compile a text beat map into the binary chart format.
+
+    The chart is written next to the source unless chart_path is given, and
+    is replaced atomically so a crash never leaves a truncated chart behind.
+
+    Returns:
+        str: Path of the compiled chart.
+    """
+    chart_path = chart_path or chart_path_for(source_path)
+    data = build_chart_bytes(source_path)
+    temp_path = chart_path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, chart_path)
+    return chart_path
+
+
+class Chart:
+    """
+    Read-only view over a compiled chart.
+
+    Iterating yields (time_start, time_end, type, lane) tuples straight from
+    the underlying buffer, which is a memory map when loaded from disk.
+    """
+    def __init__(self, buffer):
+        magic, version, _, self.count, self.max_score, self.source_mtime_ns, self.source_size = HEADER.unpack_from(buffer, 0)
+        if magic != CHART_MAGIC or version != CHART_VERSION:
+            raise ValueError("Not a compiled chart of a supported version")
+        self.buffer = buffer
+        self.records = memoryview(buffer)[HEADER.size:HEADER.size + self.count * RECORD.size]
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return RECORD.iter_unpack(self.records)
+
+    def matches(self, stat):
+        return self.source_mtime_ns == stat.st_mtime_ns and self.source_size == stat.st_size
+
+
+def _map_chart(chart_path):
+    with open(chart_path, "rb") as file:
+        return Chart(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def load_chart(source_path):
+    """
+    Return the compiled chart for a text beat map.
+
+    The chart is taken from this process's cache when the source is unchanged,
+    otherwise memory-mapped from the compiled file next to the source. The
+    source is only parsed again when its mtime or size no longer match the
+    compiled chart. If the chart cannot be written (read-only install), the
+    compiled bytes are kept in memory instead.
+    """
+    key = os.path.abspath(source_path)
+    stat = os.stat(source_path)
+    chart = _loaded_charts.get(key)
+    if chart is not None and chart.matches(stat):
+        return chart
+
+    chart_path = chart_path_for(source_path)
+    chart = None
+    if os.path.exists(chart_path):
+        try:
+            chart = _map_chart(chart_path)
+        except (OSError, ValueError, struct.error):
+            chart = None
+        if chart is not None and not chart.matches(stat):
+            chart = None
+
+    if chart is None:
+        try:
+            chart = _map_chart(compile_beat_map(source_path, chart_path))
+        except OSError:
+            chart = Chart(build_chart_bytes(source_path))
+
+    _loaded_charts[key] = chart
+    return chart
+
+
+class NoteTable:
+    """
+    Structure-of-arrays store for the notes of a chart.
+
+    Times, lanes and types live in parallel NumPy arrays sorted by start time,
+    and the per-note flags that change during play (spawned, active, checked)
+    share one state bitfield. The vectorized helpers only look at the live
+    slice of the table: notes that have been spawned and not all judged yet.
+
+    ``notes`` holds one NoteView per row for code that works on single notes
+    (sprites, judgement); its flags read and write the same state array.
+    """
+    def __init__(self, start, end, note_type, lane):
+        order = np.argsort(start, kind="stable")
+        self.start = np.asarray(start, dtype=np.float64)[order]
+        self.end = np.asarray(end, dtype=np.float64)[order]
+        self.type = np.asarray(note_type, dtype=np.uint8)[order]
+        self.lane = np.asarray(lane, dtype=np.uint8)[order]
+        self.single = self.type == TYPE_SINGLE
+        self.state = np.zeros(len(self.start), dtype=np.uint8)
+        self.floor = 0  # Every note before floor has been judged
+        self.spawned_hi = 0  # No note at or after spawned_hi has been spawned
+        self.notes = [NoteView(self, index) for index in range(len(self.start))]
+
+    @classmethod
+    def from_chart(cls, chart):
+        records = np.frombuffer(chart.records, dtype=CHART_DTYPE)
+        return cls(records["start"], records["end"], records["type"], records["lane"])
+
+    def __len__(self):
+        return len(self.start)
+
+    def set_flag(self, indices, bit, value=True):
+        if value:
+            self.state[indices] |= bit
+        else:
+            self.state[indices] &= ~np.uint8(bit)
+
+    def spawn_times(self, single_lead, long_lead):
+        """Spawn time of every note given the lead time of each note type."""
+        return np.where(self.single, self.start - single_lead, self.start - long_lead)
+
+    def mark_spawned(self, indices):
+        if len(indices):
+            self.state[indices] |= STATE_SPAWNED
+            self.spawned_hi = max(self.spawned_hi, int(indices.max()) + 1)
+
+    def mark_checked(self, indices):
+        if len(indices):
+            self.state[indices] |= STATE_CHECKED
+            self._advance_floor()
+
+    def _advance_floor(self):
+        pending = np.flatnonzero((self.state[self.floor:self.spawned_hi] & STATE_CHECKED) == 0)
+        self.floor += int(pending[0]) if len(pending) else self.spawned_hi - self.floor
+
+    def _live(self):
+        lo, hi = self.floor, self.spawned_hi
+        live = self.state[lo:hi]
+        return lo, hi, ((live & STATE_SPAWNED) != 0) & ((live & STATE_CHECKED) == 0)
+
+    def spawnable_at(self, t, spawn_times):
+        """Indices of the notes not spawned yet whose spawn time is at or before t."""
+        return np.flatnonzero((spawn_times <= t) & ((self.state & STATE_SPAWNED) == 0))
+
+    def in_grace_window_at(self, t, open_times, close_times):
+        """Indices of the spawned, unjudged notes whose grace window contains t."""
+        lo, hi, live = self._live()
+        return np.flatnonzero(live & (open_times[lo:hi] <= t) & (t <= close_times[lo:hi])) + lo
+
+    def expired_unjudged_at(self, t, close_times):
+        """Indices of the spawned notes whose grace window closed before t without a judgement."""
+        lo, hi, live = self._live()
+        return np.flatnonzero(live & (close_times[lo:hi] < t)) + lo
+
+
+class NoteView:
+    """One note of a NoteTable, with the table's state bits exposed as attributes."""
+    __slots__ = ("table", "index", "time_start", "time_end", "duration", "type", "placement", "lane")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+        self.time_start = float(table.start[index])
+        self.time_end = float(table.end[index])
+        self.duration = self.time_end - self.time_start
+        self.type = TYPE_NAMES[table.type[index]]
+        self.lane = int(table.lane[index])
+        self.placement = LANE_NAMES[self.lane]
+
+    def _flag(self, bit):
+        return bool(self.table.state[self.index] & bit)
+
+    @property
+    def spawned(self):
+        return self._flag(STATE_SPAWNED)
+
+    @spawned.setter
+    def spawned(self, value):
+        if value:
+            self.table.mark_spawned(np.array([self.index]))
+        else:
+            self.table.set_flag(self.index, STATE_SPAWNED, False)
+
+    @property
+    def active(self):
+        return self._flag(STATE_ACTIVE)
+
+    @active.setter
+    def active(self, value):
+        self.table.set_flag(self.index, STATE_ACTIVE, value)
+
+    @property
+    def checked(self):
+        return self._flag(STATE_CHECKED)
+
+    @checked.setter
+    def checked(self, value):
+        self.table.set_flag(self.index, STATE_CHECKED, value)
+        if value:
+            self.table._advance_floor()
+
+
+if __name__ == "__main__":
+    # Precompile beat maps, e.g. python resources/beatmap.py assets/tracks/*.txt
+    for path in sys.argv[1:]:
+        print(f"{path} -> {compile_beat_map(path)}")
@@ -0,0 +1,145 @@
+import os, sys, time, json, argparse, importlib
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import numpy as np
+import pygame
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(parent_dir)
+from Settings.settings import SettingsManager
+from resources.headless import SimulatedClock, AutoplayInput, load_level
+from levels.registry import levels
+
+# Scene name -> (module, class); levels come from levels.registry, take a clock and are driven by autoplay
+MENU_SCENES = {
+    "title": ("UI.TitleScreen", "TitleScreen"),
+    "level_chooser": ("UI.LevelChooser", "LevelChooserScreen"),
+    "game_over": ("UI.EndScreen", "EndScreen"),
+    "pause": ("UI.PauseScreen", "PauseScreen"),
+    "settings": ("Settings.SettingsScreen", "SettingsScreen"),
+}
+PERCENTILES = (50, 95, 99)
+
+
+def summarize(samples):
+    """ p50/p95/p99/max of a list of durations in seconds, reported in milliseconds """
+    samples = np.asarray(samples) * 1000
+    summary = {f"p{p}": round(float(value), 3) for p, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES))}
+    summary["max"] = round(float(samples.max()), 3)
+    return summary
+
+
+def build_scene(name, setting, screen, dt):
+    if name in levels:
+        scene = load_level(name, setting, screen, pygame.time.Clock())
+        clock = SimulatedClock(dt)
+        autoplay = AutoplayInput()
+        scene.time_source = clock
+        scene.read_input = lambda: autoplay(scene, clock.time - scene.start_time - scene.total_pause_time)
+        scene.on_enter()
+        return scene, clock.advance
+    module_name, class_name = MENU_SCENES[name]
+    scene = getattr(importlib.import_module(module_name), class_name)(setting, screen)
+    if hasattr(scene, "on_enter"):
+        scene.on_enter()
+    return scene, None
+
+
+def bench_scene(name, width, height, frames, warmup, dt):
+    """
+    Time update() and draw() of one scene drawing to an offscreen surface.
+
+    Returns:
+        dict: update, draw and whole-frame summaries in milliseconds.
+    """
+    setting = SettingsManager()
+    setting.screen_width, setting.screen_height = width, height
+    screen = pygame.Surface((width, height))
+    scene, tick = build_scene(name, setting, screen, dt)
+
+    update_times, draw_times = [], []
+    for frame in range(warmup + frames):
+        if tick:
+            tick()
+        start = time.perf_counter()
+        scene.update()
+        middle = time.perf_counter()
+        scene.draw()
+        end = time.perf_counter()
+        if frame >= warmup:
+            update_times.append(middle - start)
+            draw_times.append(end - middle)
+    if hasattr(scene, "on_out"):
+        scene.on_out()
+
+    return {
+        "update": summarize(update_times),
+        "draw": summarize(draw_times),
+        "frame": summarize(np.add(update_times, draw_times)),
+    }
+
+
+def run(scenes, resolutions, frames, warmup, dt):
+    report = {"frames": frames, "warmup": warmup, "results": {}}
+    for resolution in resolutions:
+        width, height = map(int, resolution.split("x"))
+        for name in scenes:
+            result = bench_scene(name, width, height, frames, warmup, dt)
+            report["results"].setdefault(name, {})[resolution] = result
+            print(f"{name:14} {resolution:>10}  update p95 {result['update']['p95']:8.3f} ms"
+                  f"  draw p95 {result['draw']['p95']:8.3f} ms  frame p99 {result['frame']['p99']:8.3f} ms")
+    return report
+
+
+def compare(report, baseline, threshold, metric="p95"):
+    """
+    List the scenes whose frame time regressed against a baseline report.
+
+    A scene regresses when its whole-frame metric grew by more than
+    threshold (a fraction, 0.1 = 10 %) over the baseline value.
+    """
+    regressions = []
+    for name, resolutions in report["results"].items():
+        for resolution, result in resolutions.items():
+            old = baseline.get("results", {}).get(name, {}).get(resolution)
+            if old is None:
+                continue
+            before, after = old["frame"][metric], result["frame"][metric]
+            if after > before * (1 + threshold):
+                regressions.append(f"{name} @ {resolution}: frame {metric} {before:.3f} ms -> {after:.3f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Frame-time benchmark of every scene at each supported resolution.")
+    parser.add_argument("--scenes", nargs="*", default=list(MENU_SCENES) + list(levels), help="Scenes to benchmark")
+    parser.add_argument("--resolutions", nargs="*", default=None, help="Defaults to SettingsManager.resolutions")
+    parser.add_argument("--frames", type=int, default=300, help="Measured update+draw cycles per scene")
+    parser.add_argument("--warmup", type=int, default=30, help="Cycles run before measuring")
+    parser.add_argument("--dt", type=float, default=1 / 120, help="Simulated frame time of the levels")
+    parser.add_argument("--output", default="benchmark.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", default=None, help="Report to compare against, exits with 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed growth of the frame p95 over the baseline")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # Needed by convert(); scenes draw to their own offscreen surface
+    resolutions = args.resolutions or SettingsManager().resolutions
+    report = run(args.scenes, resolutions, args.frames, args.warmup, args.dt)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=4)
+    print(f"Report written to {args.output}")
+    pygame.quit()
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import pygame
+
+
+class DirtyRegions:
+    """
+    Opt-in dirty-rectangle rendering for menu scenes.
+
+    The parts of a scene that do not change between frames (background,
+    title, panels) are drawn once into a static layer. Each frame the scene
+    reports its widgets with a signature of everything that affects how they
+    look; only the widgets whose signature changed are redrawn, after the
+    static layer is restored under their old and new rects. collect() then
+    returns the rects to pass to pygame.display.update(), or None when the
+    whole frame was redrawn and needs a flip.
+
+    With enabled False every frame is a full redraw, which is the original
+    behaviour.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.static_layer = None
+        self.full = True
+        self.full_pending = True
+        self.rects = []
+        self.previous = {}  # widget key -> (signature, rect)
+
+    def invalidate(self):
+        """ Rebuild the static layer and redraw everything on the next frame """
+        self.static_layer = None
+        self.full_pending = True
+
+    def force_full(self):
+        """ Redraw everything on the next frame, e.g. after something else drew over the screen """
+        self.full_pending = True
+
+    def begin(self, screen, draw_static):
+        """
+        Start a frame: restore the static layer when a full redraw is needed.
+
+        Args:
+            screen (pygame.Surface): The surface the scene draws to.
+            draw_static (callable): Draws the static parts onto the surface it is given.
+        """
+        self.rects = []
+        if not self.enabled:
+            draw_static(screen)
+            self.full = True
+            return
+        if self.static_layer is None or self.static_layer.get_size() != screen.get_size():
+            self.static_layer = pygame.Surface(screen.get_size())
+            draw_static(self.static_layer)
+            self.full_pending = True
+        self.full = self.full_pending
+        self.full_pending = False
+        if self.full:
+            screen.blit(self.static_layer, (0, 0))
+            self.previous.clear()
+
+    def refresh(self, screen, key, signature, rect):
+        """
+        Whether a widget has to be drawn this frame.
+
+        When it has, the static layer is restored under its previous and
+        current rects, which are added to the dirty list.
+        """
+        if not self.enabled:
+            return True
+        rect = pygame.Rect(rect)
+        previous = self.previous.get(key)
+        self.previous[key] = (signature, rect)
+        if self.full:
+            return True
+        if previous is not None and previous[0] == signature:
+            return False
+        area = rect if previous is None else rect.union(previous[1])
+        self.restore(screen, area)
+        return True
+
+    def remove(self, screen, key):
+        """ Restore the static layer where a widget that is no longer drawn used to be """
+        previous = self.previous.pop(key, None)
+        if self.enabled and not self.full and previous is not None:
+            self.restore(screen, previous[1])
+
+    def restore(self, screen, area):
+        area = area.clip(screen.get_rect())
+        screen.blit(self.static_layer, area, area)
+        self.rects.append(area)
+
+    def collect(self):
+        """ Rects changed this frame, or None when the whole screen has to be presented """
+        if not self.enabled or self.full or self.full_pending:
+            return None
+        return self.rects
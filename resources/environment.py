@@ -1,4 +1,5 @@
-import pygame, random, math, os, sys
+import pygame, random, math, os, sys, itertools
+import numpy as np
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(parent_dir)
 
@@ -34,13 +35,13 @@ class Wave(pygame.sprite.Sprite):
         self.offset = offset
         self.y_offset = y_offset
 
+    def phase(self, time_elapsed):
+        return self.offset - time_elapsed * self.speed
+
     def get_points(self, time_elapsed, width):
-        points = []
-        for x in range(width):
-            angle = self.frequency * x - time_elapsed * self.speed + self.offset
-            y = int(self.y_offset + self.amplitude * math.sin(angle))
-            points.append((x, y))
-        return points
+        xs = np.arange(width)
+        ys = (self.y_offset + self.amplitude * np.sin(self.frequency * xs + self.phase(time_elapsed))).astype(np.int32)
+        return list(zip(xs.tolist(), ys.tolist()))
 
 
 class Separator(pygame.sprite.Sprite):
@@ -57,21 +58,15 @@ class Separator(pygame.sprite.Sprite):
         self.waves = waves
         self.thickness = thickness  # Store the thickness
 
-    def draw(self, screen, time_elapsed):
-        # Calculate the topmost and bottommost points
-        top_y = float('inf')  # Initialize as very high
-        bottom_y = float('-inf')  # Initialize as very low
-
-        for wave in self.waves:
-            # Compute the y-position of the wave at x = self.x_pos
-            angle = wave.frequency * self.x_pos - time_elapsed * wave.speed + wave.offset
-            y = int(wave.y_offset + wave.amplitude * math.sin(angle))
-
-            # Update top and bottom bounds
-            top_y = min(top_y, y)
-            bottom_y = max(bottom_y, y)
-
-        # Draw the vertical line with the specified thickness
+    def draw(self, screen, wave_ys):
+        """
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            wave_ys (numpy.ndarray): The y-position of every wave at x_pos.
+        """
+        # Draw the vertical line between the topmost and bottommost points
+        top_y = int(wave_ys.min())
+        bottom_y = int(wave_ys.max())
         pygame.draw.line(screen, (0, 0, 0, 150), (self.x_pos, top_y), (self.x_pos, bottom_y), self.thickness)
 
 
@@ -92,19 +87,26 @@ class BoundedImage(pygame.sprite.Sprite):
         self.offset_x = offset_x
         self.offset_y = offset_y
 
-    def draw(self, screen, time_elapsed):
-        # Follow the vertical motion of the linked wave
-        wave_y = self.linked_wave.amplitude * math.sin(
-            -time_elapsed * self.linked_wave.speed + self.linked_wave.offset
-        )
-        y_pos = int(self.linked_wave.y_offset + wave_y)
-        screen.blit(self.image, (self.offset_x, y_pos + self.offset_y))  # Adjusted position
+    def draw(self, screen, wave_y):
+        """Follow the vertical motion of the linked wave, wave_y is its y-position at x = 0."""
+        screen.blit(self.image, (self.offset_x, int(wave_y) + self.offset_y))  # Adjusted position
 
 
 class MusicStaff:
-    def __init__(self, width, height, wave_params, clef_image, separator_positions):
+    """
+    Animated staff lines with separators and a clef riding on the waves.
+
+    Every wave is evaluated in one NumPy pass per frame over a fixed array of
+    x positions: the polyline samples (every sample_stride pixels, plus the
+    right edge) followed by the separator positions. The x-dependent part of
+    each angle is computed once, and the angle and point buffers are reused
+    between frames. Separators and the clef read their y-positions from the
+    same samples.
+    """
+    def __init__(self, width, height, wave_params, clef_image, separator_positions, sample_stride=1):
         self.width = width
         self.height = height
+        self.sample_stride = sample_stride
         self.waves = pygame.sprite.Group()
         self.separators = pygame.sprite.Group()
         self.bounded_images = pygame.sprite.Group()
@@ -113,35 +115,68 @@ class MusicStaff:
         self._initialize_waves(wave_params)
         self._initialize_separators(separator_positions)
         self._initialize_bounded_images(clef_image)
+        self._initialize_samples()
 
     def _initialize_waves(self, wave_params):
         for params in wave_params:
             self.waves.add(Wave(**params))
+        self.wave_list = list(self.waves)
 
     def _initialize_separators(self, separator_positions):
         # Create separators, each linked to all waves
         for pos in separator_positions:
-            self.separators.add(Separator(pos, list(self.waves), ))
+            self.separators.add(Separator(pos, self.wave_list, ))
 
     def _initialize_bounded_images(self, clef_image):
         # Create BoundedImage for the clef, linked to a middle wave
-        self.bounded_images.add(BoundedImage(clef_image, list(self.waves)[2]))
-    
+        self.bounded_images.add(BoundedImage(clef_image, self.wave_list[2]))
+
+    def _initialize_samples(self):
+        line_xs = np.arange(0, self.width, self.sample_stride)
+        if line_xs[-1] != self.width - 1:
+            line_xs = np.append(line_xs, self.width - 1)
+        self.line_count = len(line_xs)
+        # Separators read the columns after the polyline samples
+        self.separator_columns = {separator: self.line_count + i for i, separator in enumerate(self.separators)}
+        xs = np.concatenate([line_xs, [separator.x_pos for separator in self.separators]]).astype(np.float64)
+
+        frequencies = np.array([wave.frequency for wave in self.wave_list], dtype=np.float64)
+        self.amplitudes = np.array([wave.amplitude for wave in self.wave_list], dtype=np.float64)[:, None]
+        self.y_offsets = np.array([wave.y_offset for wave in self.wave_list], dtype=np.float64)[:, None]
+        self.base_angles = frequencies[:, None] * xs[None, :]
+        self.angles = np.empty_like(self.base_angles)
+        self.samples = np.empty(self.base_angles.shape, dtype=np.int32)
+        self.points = np.empty((len(self.wave_list), self.line_count, 2), dtype=np.int32)
+        self.points[:, :, 0] = line_xs
+
+    def evaluate(self):
+        """Compute the y-position of every wave at every sample for the current time."""
+        phases = np.array([wave.phase(self.time_elapsed) for wave in self.wave_list])[:, None]
+        np.add(self.base_angles, phases, out=self.angles)
+        np.sin(self.angles, out=self.angles)
+        self.angles *= self.amplitudes
+        self.angles += self.y_offsets
+        # Truncate like int() did for every point
+        np.copyto(self.samples, self.angles, casting="unsafe")
+        self.points[:, :, 1] = self.samples[:, :self.line_count]
+        return self.samples
+
     def update(self, dt):
         self.time_elapsed += dt
 
     def draw(self, screen):
+        samples = self.evaluate()
+
         # Draw the waves
-        for wave in self.waves:
-            points = wave.get_points(self.time_elapsed, self.width)
-            pygame.draw.lines(screen, (0, 0, 0, 150), False, points, 5)
+        for points in self.points:
+            pygame.draw.lines(screen, (0, 0, 0, 150), False, points.tolist(), 5)
 
         # Draw separators and BoundedImages (e.g., clef)
         for separator in self.separators:
-            separator.draw(screen, self.time_elapsed)
+            separator.draw(screen, samples[:, self.separator_columns[separator]])
 
         for bounded_image in self.bounded_images:
-            bounded_image.draw(screen, self.time_elapsed)
+            bounded_image.draw(screen, samples[self.wave_list.index(bounded_image.linked_wave), 0])
 
 def generate_bird_positions(num_birds, game_width, game_height):
     positions = []
@@ -186,186 +221,209 @@ def generate_bird_positions(num_birds, game_width, game_height):
     return positions
 
 
-def calculate_alpha(distance_to_reset, max_distance, easing=1):
-        """
-        Calculate the alpha value based on distance to reset using different easing functions.
-
-        Parameters:
-            distance_to_reset (float): Distance from the particle to the reset boundary.
-            max_distance (float): Maximum possible distance for the particle.
-            easing (str): The easing function to use. Options: "linear", "quadratic", "exponential".
+class ParticleEngine:
+    """
+    Structure-of-arrays particle store that can drive several emitters.
+
+    Positions (top-left, in pixels) and the stamp each particle is drawn
+    with live in NumPy arrays; every emitter owns a contiguous slice of them.
+    Movement, diffusion and wrap-around run as vector operations over a
+    slice, and particles are drawn with one Surface.blits call from a small
+    cache of pre-rendered stamps shared by all particles of the same shape,
+    size and colour.
+    """
+    color_levels = (50, 118, 186, 255)  # Particle colours are quantised so stamps can be shared
+
+    def __init__(self, capacity=256):
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.stamp = np.zeros(capacity, dtype=np.int32)
+        self.count = 0
+        self.stamps = []
+        self.stamp_index = {}  # (shape, radius, color) -> index into stamps
+        self.rng = np.random.default_rng()
+
+    def allocate(self, count):
+        """ Reserve count particles and return the slice that addresses them """
+        if self.count + count > len(self.x):
+            capacity = max(self.count + count, 2 * len(self.x))
+            for name in ("x", "y", "stamp"):
+                array = getattr(self, name)
+                grown = np.zeros(capacity, dtype=array.dtype)
+                grown[:self.count] = array[:self.count]
+                setattr(self, name, grown)
+        particles = slice(self.count, self.count + count)
+        self.count += count
+        return particles
 
-        Returns:
-            int: Calculated alpha value (0 to 255).
+    def get_stamp(self, shape, radius, color):
+        key = (shape, radius, color)
+        index = self.stamp_index.get(key)
+        if index is None:
+            size = radius * 2 if shape != "pixel" else 1  # Pixel size is always 1x1
+            image = pygame.Surface((size, size), pygame.SRCALPHA)
+            if shape == "circle":
+                pygame.draw.circle(image, color, (radius, radius), radius)
+            elif shape == "square":
+                pygame.draw.rect(image, color, (0, 0, size, size))
+            elif shape == "pixel":
+                image.fill(color)
+            index = self.stamp_index[key] = len(self.stamps)
+            self.stamps.append(image)
+        return index
+
+    def random_color(self):
+        return tuple(int(level) for level in self.rng.choice(self.color_levels, 3))
+
+    def step(self, particles, dt, velocity, left_wall, right_wall, bottom, diffuse_range=5, diffuse_probability=0.3):
         """
-        progress = distance_to_reset / max_distance  # Normalize distance to a 0-1 range
-
-        alpha = 255
-
-        return max(0, min(255, int(alpha)))  # Ensure alpha is in the valid range
-
+        Move a slice of particles along x, diffuse them and wrap them between the walls.
 
-class Particles(pygame.sprite.Sprite):
-    def __init__(self, x, y, move_direction, speed = 400, radius=1, left_wall=0, right_wall=800, shape="circle"):
-        super().__init__()
-        self.shape = shape
-        size = radius * 2 if shape != "pixel" else 1  # Pixel size is always 1x1
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)  # Surface with transparency
-        self.image.fill((0, 0, 0, 0))  # Transparent fill
-
-        # Generate random rainbow color
-        self.color = (
-            random.randint(50, 255),
-            random.randint(50, 255),
-            random.randint(50, 255)
-        )
-        
-        # Draw the specified shape
-        if shape == "circle":
-            pygame.draw.circle(self.image, self.color, (radius, radius), radius)
-        elif shape == "square":
-            pygame.draw.rect(self.image, self.color, (0, 0, size, size))
-        elif shape == "pixel":
-            self.image.fill(self.color)  # A single pixel is just a filled Surface
+        Args:
+            particles (slice): Slice returned by allocate().
+            dt (float): Time since the previous frame.
+            velocity (float): Horizontal speed in pixels per second, negative to move left.
+            left_wall, right_wall (int): Particles leaving one wall re-enter at the other.
+            bottom (int): Particles are kept between y 0 and bottom.
+        """
+        x = self.x[particles]
+        y = self.y[particles]
+        x += round(velocity * dt)
 
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)  # Position the particle
-        self.speed = 400  # Pixels per second
-        self.move_direction = move_direction
-        self.left_wall = left_wall
-        self.right_wall = right_wall
+        diffusing = np.flatnonzero(self.rng.random(len(x)) < diffuse_probability)
+        if len(diffusing):
+            x[diffusing] += self.rng.integers(0, diffuse_range + 1, len(diffusing), dtype=np.int32)
+            y[diffusing] += self.rng.integers(-diffuse_range, diffuse_range + 1, len(diffusing), dtype=np.int32)
 
-        # Random diffusion parameters
-        self.diffuse_range = 5  # Maximum pixel offset for diffusion
-        self.diffuse_probability = 0.3  # Probability of diffusing at each frame
+        # Reset when reaching walls
+        passed_left = x < left_wall
+        passed_right = x > right_wall
+        x[passed_left] = right_wall
+        x[passed_right] = left_wall
+        np.clip(y, 0, bottom, out=y)
 
-    def update(self, dt):
-        # Main movement along the x-axis
-        self.rect.x += self.move_direction * round(self.speed * dt)
-        
-        # Diffusing motion
-        if random.random() < self.diffuse_probability:  # Add randomness to simulate diffusion
-            dx = 0
-            dx = random.randint(0, self.diffuse_range)
-            dy = random.randint(-self.diffuse_range, self.diffuse_range)
-            self.rect.x += dx
-            self.rect.y += dy
+    def draw(self, particles, surface, offset_x=0, offset_y=0):
+        stamps = self.stamps
+        surface.blits([(stamps[stamp], (x + offset_x, y + offset_y)) for stamp, x, y in
+                       zip(self.stamp[particles].tolist(), self.x[particles].tolist(), self.y[particles].tolist())],
+                      doreturn=False)
 
-        # Reset when reaching walls
-        if self.rect.x < self.left_wall:
-            self.rect.x = self.right_wall
-        elif self.rect.x > self.right_wall:
-            self.rect.x = self.left_wall
 
-        # Keep particles within vertical screen bounds
-        self.rect.y = max(0, min(self.rect.y, pygame.display.get_surface().get_height()))
+class Trailing:
+    """
+    A trail of particles behind a sprite, simulated by a ParticleEngine.
 
+    Pass the same engine to several trails to drive them from one set of
+    arrays; without one the trail gets its own engine.
+    """
+    particle_speed = 400  # Trail particles have always moved at 400 px/s, whatever the trail's speed
 
-class Trailing(pygame.sprite.Group):
-    def __init__(self, height, width, speed = 400, left_wall=0, right_wall=800, num_particles=50, move_direction=1, shape="circle"):
-        super().__init__()
-        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    def __init__(self, height, width, speed = 400, left_wall=0, right_wall=800, num_particles=50, move_direction=1, shape="circle", engine=None, bottom_wall=None):
         self.height = height
         self.width = width
         self.left_wall = left_wall
         self.right_wall = right_wall
+        # Particles are kept between y 0 and bottom_wall, by default the trail's own height
+        self.bottom_wall = bottom_wall if bottom_wall is not None else height
         self.num_particles = num_particles
         self.move_direction = move_direction
         self.shape = shape
         self.speed = speed
+        self.engine = engine if engine is not None else ParticleEngine(num_particles)
         self.particles = self._create_particles()
-        
+
     def _create_particles(self):
-        particles = []
-        for _ in range(self.num_particles):
+        engine = self.engine
+        particles = engine.allocate(self.num_particles)
+        for index in range(particles.start, particles.stop):
             x = random.randint(self.left_wall, self.right_wall)
             y = random.randint(0, self.height)
             radius = random.randint(4, 7)  # Random radius
-            particle = Particles(x, y, self.move_direction, self.speed, radius, self.left_wall, self.right_wall, shape=self.shape)
-            particles.append(particle)
-            self.add(particle)
+            half_size = radius if self.shape != "pixel" else 0
+            # Positions are top-left corners, the particle is centred on (x, y)
+            engine.x[index] = x - half_size
+            engine.y[index] = y - half_size
+            engine.stamp[index] = engine.get_stamp(self.shape, radius, engine.random_color())
         return particles
 
-    def update(self, dt, alpha_easing=0.5):
-        for particle in self.sprites():
-            # Calculate distance to reset wall
-            if self.move_direction > 0:  # Moving right
-                distance_to_reset = self.right_wall - particle.rect.x
-            else:  # Moving left
-                distance_to_reset = particle.rect.x - self.left_wall
-
-            max_distance = self.width
-
-            # Use the alpha calculation function
-            alpha = calculate_alpha(distance_to_reset, max_distance, easing=alpha_easing)
-            particle.image.set_alpha(alpha)
-
-            particle.update(dt)
+    def update(self, dt):
+        self.engine.step(self.particles, dt, self.move_direction * self.particle_speed, self.left_wall, self.right_wall, self.bottom_wall)
 
     def draw(self, screen, x, y):
-        self.surface.fill((0, 0, 0, 0))  # Clear the surface with transparency
-        super().draw(self.surface)
-        screen.blit(self.surface, (x, y))  # Draw the trailing surface on the main screen
-
-class Raindrop(pygame.sprite.Sprite):
-    def __init__(self, x, y, speed, length):
-        super().__init__()
-        self.speed = speed
-        self.length = length
-        self.rain_color = (135, 206, 250)
-        
-        # Create the image surface
-        self.image = pygame.Surface((2, length), pygame.SRCALPHA)  # Transparent surface
-        pygame.draw.line(self.image, self.rain_color, (0, 0), (0, self.length), 2)
-        
-        # Set up rect for position tracking
-        self.rect = self.image.get_rect()
-        self.rect.topleft = (x, y)
-
-    def update(self, screen_height, dt):
-        """Update the position of the raindrop."""
-        self.rect.y += self.speed * dt  # Update the position using the rect
-        if self.rect.y > screen_height:  # Reset if out of bounds
-            self.rect.y = -self.length  # Reset above the screen
-
-class Snow(pygame.sprite.Sprite):
-    def __init__(self, x, y, speed, length):
-        super().__init__()
-        self.speed = speed
-        self.length = length
-        self.snow_color = (255,255,255)
-        
-        # Create the image surface
-        self.image = pygame.Surface((length, length), pygame.SRCALPHA)  # Transparent surface
-        pygame.draw.line(self.image, self.snow_color, (self.length//2, 0), (self.length//2, self.length), 1)
-        pygame.draw.line(self.image, self.snow_color, (0, self.length//2), (self.length, self.length//2), 1)
-        
-        # Set up rect for position tracking
-        self.rect = self.image.get_rect()
-        self.rect.topleft = (x, y)
+        """Draw the particles inside the trail's area, whose top-left corner is (x, y)."""
+        clip = screen.get_clip()
+        screen.set_clip(clip.clip(pygame.Rect(x, y, self.width, self.height)))
+        self.engine.draw(self.particles, screen, x, y)
+        screen.set_clip(clip)
+
+class Precipitation:
+    """
+    Batched snow, rain, stars and birds.
+
+    Positions, speeds and reset heights live in NumPy arrays and the whole
+    field moves with one vectorized step per frame, then is drawn with a
+    single Surface.blits call over the particles' images. Particles either
+    fall (axis 1), restarting at their own reset height once they pass the
+    bottom, or drift sideways (axis 0), wrapping between 0 and the width.
+
+    Args:
+        width, height (int): Size of the area the particles move in.
+        axis (int): 1 to fall, 0 to drift sideways.
+        direction (int): 1 to move down or right, -1 to move up or left.
+        rounding (callable): How per-frame steps are rounded to whole pixels, e.g. np.ceil so slow particles still move.
+    """
+    def __init__(self, width, height, axis=1, direction=1, rounding=np.rint):
+        self.width = width
+        self.height = height
+        self.axis = axis
+        self.direction = direction
+        self.rounding = rounding
+        self.images = []
+        self.positions = np.zeros((0, 2), dtype=np.int32)  # Top-left corners
+        self.speeds = np.zeros(0, dtype=np.float64)
+        self.resets = np.zeros(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.images)
+
+    def add(self, images, positions, speeds, resets=None):
+        """
+        Add particles.
 
-    def update(self, screen_height, dt):
-        """Update the position of the raindrop."""
-        self.rect.y += round(self.speed * dt)  # Update the position using the rect
-        if self.rect.y > screen_height:  # Reset if out of bounds
-            self.rect.y = -self.length  # Reset above the screen
+        Args:
+            images (list): Surface of each particle, usually a handful of shared surfaces.
+            positions: (n, 2) top-left corners.
+            speeds: Speed of each particle in pixels per second.
+            resets: Where falling particles restart once they pass the bottom, defaults to just above the top.
+        """
+        self.images.extend(images)
+        self.positions = np.concatenate((self.positions, np.asarray(positions, dtype=np.int32).reshape(-1, 2)))
+        self.speeds = np.concatenate((self.speeds, np.asarray(speeds, dtype=np.float64)))
+        if resets is None:
+            resets = [-image.get_height() for image in images]
+        self.resets = np.concatenate((self.resets, np.asarray(resets, dtype=np.int32)))
+
+    def resize(self, width, height):
+        """ Move to a new area size, scaling the particles' positions so the field keeps its spread """
+        scale = np.array([width / self.width, height / self.height])
+        self.positions = np.rint(self.positions * scale).astype(np.int32)
+        self.width = width
+        self.height = height
 
-class Stars(pygame.sprite.Sprite):
-    def __init__(self, x, y, move_direction, radius=1):
-        super().__init__()
-        self.image = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)  # Surface with transparency
-        self.image.fill((0, 0, 0, 0))  # Transparent fill
-        pygame.draw.circle(self.image, (255, 255, 255), (radius, radius), radius)  # Draw a white circle (star)
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)  # Position the star at the specified coordinates
-        self.speed = random.randint(1,3)
-        self.move_direction = move_direction
-        
-    def update(self, screen_width, dt):
-        self.rect.x += self.move_direction * math.ceil(self.speed * dt)
-        
-        # Keep stars within bounds (reset to the other side)
-        if self.rect.x < 0:
-            self.rect.x = screen_width  # Reset to the right side
-        elif self.rect.x > screen_width:
-            self.rect.x = 0  # Reset to the left side
\ No newline at end of file
+    def update(self, dt):
+        steps = self.rounding(self.speeds * dt)
+        moving = self.positions[:, self.axis]
+        moving += self.direction * steps.astype(np.int32)
+        if self.axis == 1:
+            passed = moving > self.height
+            moving[passed] = self.resets[passed]
+        else:
+            # Keep particles within bounds (reset to the other side)
+            moving[moving < 0] = self.width
+            moving[moving > self.width] = 0
+
+    def draw(self, surface, image=None):
+        """ Draw every particle, with its own image or with image when given (e.g. a shared animation frame) """
+        positions = self.positions.tolist()
+        images = itertools.repeat(image) if image is not None else self.images
+        surface.blits(zip(images, positions), doreturn=False)
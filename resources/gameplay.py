@@ -0,0 +1,279 @@
+import heapq
+from bisect import insort
+from itertools import count
+import numpy as np
+from resources.tools import load_frames_from_spritesheet
+
+# Integer lane codes used by notes and the judgement engine
+LANE_UP = 0
+LANE_MIDDLE = 1
+LANE_DOWN = 2
+LANE_ANY = 3  # Single notes of level 1 can be hit from any lane
+LANE_CODES = {"up": LANE_UP, "middle": LANE_MIDDLE, "down": LANE_DOWN, "single": LANE_ANY}
+
+
+def held_lanes(up_pressed, down_pressed):
+    """Return a bitmask of the lanes the ship currently satisfies."""
+    mask = 1 << LANE_ANY
+    if up_pressed:
+        mask |= 1 << LANE_UP
+    if down_pressed:
+        mask |= 1 << LANE_DOWN
+    if not (up_pressed or down_pressed):
+        mask |= 1 << LANE_MIDDLE
+    return mask
+
+
+class ObstacleAtlas:
+    """
+    Animation frames shared by every obstacle of a level.
+
+    All obstacles animate in lockstep, so the level keeps one atlas and each
+    obstacle only records which half of it (basic or hit) it is showing.
+    """
+    def __init__(self, basic_image_path, hit_image_path, width=40, height=40, frame_count=32):
+        self.basic_frames, self.frame_width, self.frame_height = load_frames_from_spritesheet(basic_image_path, frame_count, 1)
+        self.hit_frames, _, _ = load_frames_from_spritesheet(hit_image_path, frame_count, 1)
+        self.frame_count = frame_count
+        # Hit box of a single obstacle, the frames are blitted from its top-left corner
+        self.width = width
+        self.height = height
+
+    def frame(self, index, is_hit):
+        return self.hit_frames[index] if is_hit else self.basic_frames[index]
+
+
+class Obstacle:
+    """Lightweight obstacle record: the note it belongs to, its top-left position and hit flag."""
+    __slots__ = ("note", "x", "y", "is_hit")
+
+    def __init__(self, note, x, y):
+        self.note = note
+        self.x = x
+        self.y = y
+        self.is_hit = False
+
+    def move(self, speed, dt):
+        """Move the obstacle left or right depending on speed."""
+        self.x -= round(speed * dt)
+
+    def unhit(self):
+        """Set the obstacle to its unhit state."""
+        self.is_hit = False
+
+    def hit(self):
+        """Set the obstacle to its hit state."""
+        self.is_hit = True
+
+
+class ObstacleGroup:
+    """Container for the obstacles of a level, rendered by index into a shared ObstacleAtlas."""
+    def __init__(self, atlas):
+        self.atlas = atlas
+        self.obstacles = []
+        self.frame_delay_static = 50 / 1000
+        self.frame_delay_collision = 1 / 2000
+        self.accumulated_time = 0
+        self.frame_delay = self.frame_delay_static
+        self.current_frame = 0
+
+    def __iter__(self):
+        return iter(self.obstacles)
+
+    def __len__(self):
+        return len(self.obstacles)
+
+    def spawn(self, note, center_x, center_y):
+        """Create an obstacle centred on (center_x, center_y) and add it to the group."""
+        obstacle = Obstacle(note, round(center_x - self.atlas.width / 2), round(center_y - self.atlas.height / 2))
+        self.obstacles.append(obstacle)
+        return obstacle
+
+    def remove(self, obstacle):
+        self.obstacles.remove(obstacle)
+
+    def empty(self):
+        self.obstacles.clear()
+
+    def scroll(self, speed, dt):
+        """Move every obstacle and drop the judged ones that left the screen."""
+        width = self.atlas.width
+        for obstacle in self.obstacles:
+            obstacle.move(speed, dt)
+        self.obstacles = [obstacle for obstacle in self.obstacles
+                          if obstacle.x + width >= 0 or not obstacle.note.checked]
+
+    def update(self, dt):
+        self.accumulated_time += dt
+        if self.accumulated_time >= self.frame_delay:
+            self.current_frame = (self.current_frame + 1) % self.atlas.frame_count
+            self.accumulated_time = 0
+
+    def draw(self, surface):
+        basic_frame = self.atlas.basic_frames[self.current_frame]
+        hit_frame = self.atlas.hit_frames[self.current_frame]
+        surface.blits([(hit_frame if obstacle.is_hit else basic_frame, (obstacle.x, obstacle.y))
+                       for obstacle in self.obstacles], doreturn=False)
+
+
+class NoteScheduler:
+    """
+    Precomputed spawn schedule for a NoteTable.
+
+    Single notes and long notes travel at different speeds, so the spawn time
+    of every note is computed once from its type's lead time and sorted when
+    the level is reset. Each frame a binary search finds how far the schedule
+    has advanced, and the newly due notes are flagged spawned in one array
+    operation instead of scanning the whole song.
+    """
+    def __init__(self, notes, single_lead, long_lead):
+        self.notes = notes
+        spawn_times = notes.spawn_times(single_lead, long_lead)
+        self.order = np.argsort(spawn_times, kind="stable")
+        self.spawn_times = spawn_times[self.order]
+        self.cursor = 0
+
+    def due(self, current_time):
+        """Return the notes whose spawn time has been reached since the last call, in spawn order."""
+        end = int(np.searchsorted(self.spawn_times, current_time, side="right"))
+        if end <= self.cursor:
+            return []
+        indices = self.order[self.cursor:end]
+        self.cursor = end
+        self.notes.mark_spawned(indices)
+        return [self.notes.notes[index] for index in indices]
+
+    def finished(self):
+        """True once every note of the beat map has been handed out."""
+        return self.cursor == len(self.spawn_times)
+
+
+class JudgementEngine:
+    """
+    Scores the notes whose grace window is open.
+
+    Spawned obstacles and guidelines wait in a queue ordered by the time their
+    window opens. Once open they move to the active list, ordered by the time
+    the window closes (time_end plus grace), and are retired as soon as they
+    have been judged. Each frame only touches the notes that can currently be
+    judged, however many are still scrolling on screen. Single notes whose
+    window closed without a hit are found with one sweep over the live slice
+    of the NoteTable.
+
+    Single notes are hit with the trigger (hop or activate) while the ship is
+    in the note's lane. Their window is centred on time_end by default, levels
+    that open it at time_start pass single_opens_at_start. Long notes score
+    long_score every 0.1 s the ship holds their lane and are judged once their
+    time_end has passed.
+    """
+    def __init__(self, notes, grace_period, single_score=10, long_score=1, single_opens_at_start=False, single_grace_scale=1.0):
+        self.notes = notes
+        self.grace_period = grace_period
+        self.single_score = single_score
+        self.long_score = long_score
+        self.single_opens_at_start = single_opens_at_start
+        self.single_grace = grace_period * single_grace_scale
+        # Grace window of every note of the table
+        single_open_times = (notes.start if single_opens_at_start else notes.end) - self.single_grace
+        self.open_times = np.where(notes.single, single_open_times, notes.start - grace_period)
+        self.close_times = np.where(notes.single, notes.end + self.single_grace, notes.end + grace_period)
+        self.single_close_times = np.where(notes.single, self.close_times, np.inf)
+        self.order = count()
+        self.pending = []  # heap of (open_time, order, close_time, is_single, item)
+        self.active = []  # sorted list of (close_time, order, is_single, item)
+        self.score = 0
+        self.perfect = 0
+        self.misses = 0
+        self.streak = 0
+
+    def add_obstacle(self, obstacle):
+        self._add(obstacle, True)
+
+    def add_guideline(self, guideline):
+        self._add(guideline, False)
+
+    def _add(self, item, is_single):
+        index = item.note.index
+        heapq.heappush(self.pending, (float(self.open_times[index]), next(self.order),
+                                      float(self.close_times[index]), is_single, item))
+
+    def reset_streak(self):
+        """ Reset the streak counter """
+        if self.streak > 0:
+            print(f"Streak Ended. Final Streak: {self.streak}")
+        self.streak = 0
+
+    def update(self, current_time, dt, lanes, trigger):
+        """
+        Judge every note whose window is open at current_time.
+
+        Args:
+            current_time (float): Song time in seconds.
+            dt (float): Time since the previous frame.
+            lanes (int): Bitmask from held_lanes() for the ship's current input.
+            trigger (bool): Whether the hit button (hop/activate) is pressed.
+
+        Returns:
+            bool | None: Whether the ship is following a long note, or None
+            when no long note is in its window.
+        """
+        expired = self.notes.expired_unjudged_at(current_time, self.single_close_times)
+        if len(expired):
+            # Single notes whose window closed without a hit
+            self.misses += len(expired)
+            self.reset_streak()
+            self.notes.mark_checked(expired)
+
+        while self.pending and self.pending[0][0] <= current_time:
+            _, order, close_time, is_single, item = heapq.heappop(self.pending)
+            insort(self.active, (close_time, order, is_single, item))
+
+        collided = None
+        survivors = []
+        for entry in self.active:
+            close_time, _, is_single, item = entry
+            note = item.note
+            correct = lanes >> note.lane & 1
+            if is_single:
+                if note.checked:
+                    continue
+                if correct and trigger:
+                    self.score += self.single_score
+                    item.hit()
+                    self.streak += 1
+                    self.perfect += 1
+                    note.checked = True
+                    continue
+                survivors.append(entry)
+                continue
+
+            if current_time <= close_time:
+                if correct:
+                    collided = True
+                    note.active = True
+                    item.correct_frames += dt
+                    item.total_correct_frames += dt
+                    if item.correct_frames >= 0.1:
+                        self.score += self.long_score
+                        item.correct_frames = 0
+                else:
+                    collided = bool(collided)
+                    note.active = False
+                    item.correct_frames = 0
+                if not correct and note.time_start + self.grace_period <= current_time <= note.time_end - self.grace_period:
+                    self.reset_streak()
+
+            # At the end of the guideline duration, determine if it was perfect or missed
+            if current_time > note.time_end and not note.checked:
+                if item.total_correct_frames >= note.duration - self.grace_period * 2:
+                    self.perfect += 1
+                    self.streak += 1
+                if item.total_correct_frames == 0:
+                    self.misses += 1
+                    self.reset_streak()
+                note.checked = True
+
+            if current_time <= close_time:
+                survivors.append(entry)
+        self.active = survivors
+        return collided
@@ -0,0 +1,167 @@
+from collections import OrderedDict
+import numpy as np
+import pygame
+from resources.startup import startup
+from resources.surfacecache import default_disk_cache
+from resources.sceneloader import run_steps
+
+
+def rows_to_surface(rows, width):
+    """
+    Turn one RGB colour per row into an opaque SRCALPHA surface of the given width.
+
+    Args:
+        rows (np.ndarray): (height, 3) uint8 colours, top to bottom.
+        width (int): Width of the surface.
+    """
+    return run_steps(iter_rows_to_surface(rows, width))
+
+
+def iter_rows_to_surface(rows, width, band_height=256):
+    """
+    rows_to_surface as a generator for scene loaders.
+
+    The surface is allocated first, then the rows are stretched to the
+    width band_height rows at a time, with a yield after every band.
+    Returns the surface.
+    """
+    height = len(rows)
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    if width == 0 or height == 0:
+        return surface
+    column = pygame.surfarray.make_surface(np.ascontiguousarray(rows[np.newaxis, :, :]))
+    yield
+    for top in range(0, height, band_height):
+        band = column.subsurface((0, top, 1, min(band_height, height - top)))
+        surface.blit(pygame.transform.scale(band, (width, band.get_height())), (0, top))
+        yield
+    return surface
+
+
+def linear_rows(top_color, bottom_color, height, gamma=1.0, supersample=1):
+    """
+    Row colours of a gradient from top_color to bottom_color.
+
+    With supersample > 1 the gradient is evaluated at that many rows per
+    pixel row and averaged back down, which is what drawing it taller and
+    smoothscaling it did.
+    """
+    steps = height * supersample
+    factor = np.power(np.arange(steps) / max(steps, 1), gamma)
+    top = np.asarray(top_color[:3], dtype=np.float64)
+    bottom = np.asarray(bottom_color[:3], dtype=np.float64)
+    rows = np.trunc(top + (bottom - top) * factor[:, np.newaxis])
+    if supersample > 1:
+        rows = np.rint(rows.reshape(height, supersample, 3).mean(axis=1))
+    return rows.astype(np.uint8)
+
+
+def rainbow_rows(height):
+    """Row colours of a full-saturation hue sweep, red at the bottom cycling back to red at the top."""
+    hue = 1 - np.arange(height) / max(height, 1)
+    sector = np.floor(hue * 6.0)
+    f = hue * 6.0 - sector
+    sector = sector.astype(np.int64) % 6
+    ones, zeros = np.ones(height), np.zeros(height)
+    q, t = 1 - f, f
+    # Same sectors as colorsys.hsv_to_rgb with s = v = 1
+    r = np.choose(sector, [ones, q, zeros, zeros, t, ones])
+    g = np.choose(sector, [t, ones, ones, q, zeros, zeros])
+    b = np.choose(sector, [zeros, zeros, t, ones, ones, q])
+    return (np.column_stack((r, g, b)) * 255).astype(np.uint8)
+
+
+def apply_rounded_mask(surface, border_radius, special_flags=pygame.BLEND_RGBA_MULT):
+    """ Cut the corners of a surface to a rounded rectangle """
+    mask_surface = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+    pygame.draw.rect(mask_surface, (255, 255, 255, 255), mask_surface.get_rect(), border_radius=border_radius)
+    surface.blit(mask_surface, (0, 0), special_flags=special_flags)
+    return surface
+
+
+class GradientCache:
+    """
+    Memoized gradient surfaces with least-recently-used eviction.
+
+    Gradients are keyed by (kind, size, colors, border radius). Cached
+    surfaces are shared between callers, so they must be treated as
+    read-only: blit or scale them, never draw on them. The cache holds at
+    most max_entries surfaces and max_bytes of pixels; past either bound the
+    least recently used gradients are dropped.
+
+    With a disk cache (resources.surfacecache), misses are looked up on disk
+    before being built and what gets built is written back, so later
+    launches read the pixels instead of generating them.
+    """
+    def __init__(self, max_entries=512, max_bytes=96 * 1024 * 1024, disk=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        """ Return the cached surface for key, building it with build() on a miss """
+        surface = self.lookup(key)
+        if surface is None:
+            with startup.span("gradient", key[0]):
+                surface = build()
+            self.add(key, surface)
+        return surface
+
+    def iter_get(self, key, build_steps):
+        """
+        get() as a generator for scene loaders.
+
+        build_steps() returns a generator that yields between the parts of
+        the build and returns the surface, so a miss is built a part at a
+        time. Returns the surface.
+        """
+        surface = self.lookup(key)
+        if surface is None:
+            # Only timed while starting up, when scenes are built in one go
+            with startup.span("gradient", key[0]):
+                surface = yield from build_steps()
+            yield
+            self.add(key, surface)
+        return surface
+
+    def lookup(self, key):
+        """ The surface for key from memory or disk, or None """
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.disk.load(key) if self.disk is not None else None
+        if surface is not None:
+            self.insert(key, surface)
+        return surface
+
+    def add(self, key, surface):
+        """ Keep a surface just built for key, on disk too """
+        if self.disk is not None:
+            self.disk.store(key, surface)
+        self.insert(key, surface)
+
+    def insert(self, key, surface):
+        self.entries[key] = surface
+        self.bytes += self._size(surface)
+        while len(self.entries) > 1 and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= self._size(evicted)
+
+    @staticmethod
+    def _size(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+
+# Shared by every gradient helper in resources.UIElements
+gradient_cache = GradientCache(disk=default_disk_cache())
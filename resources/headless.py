@@ -0,0 +1,167 @@
+import os, sys, time, json, argparse
+# The dummy drivers must be selected before pygame initialises its subsystems
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(parent_dir)
+from Settings.settings import SettingsManager
+from resources.gameplay import LANE_UP, LANE_DOWN
+from levels.registry import levels
+
+
+class SimulatedClock:
+    """Clock that only moves when the driver advances it by a fixed dt."""
+    def __init__(self, dt=1 / 120):
+        self.dt = dt
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+    def advance(self):
+        self.time += self.dt
+
+
+def lane_input(lane, trigger):
+    """ (up, down, trigger) tuple that puts the ship in a lane """
+    return (lane == LANE_UP, lane == LANE_DOWN, trigger)
+
+
+class IdleInput:
+    """Never presses anything, every note ends up missed."""
+    def __call__(self, level, song_time):
+        return (False, False, False)
+
+
+class AutoplayInput:
+    """
+    Plays the level from its note table.
+
+    Long notes are followed from the moment their grace window opens, single
+    notes are triggered as soon as their window is open, using the same
+    windows the level's JudgementEngine judges with.
+    """
+    def __call__(self, level, song_time):
+        notes, judge = level.note_table, level.judge
+        live = notes.in_grace_window_at(song_time, judge.open_times, judge.close_times)
+        if not len(live):
+            return (False, False, False)
+        singles = live[notes.single[live]]
+        if len(singles):
+            return lane_input(notes.lane[singles[0]], True)
+        return lane_input(notes.lane[live[0]], False)
+
+
+class ScriptedInput:
+    """
+    Replays an input script.
+
+    Each line of the script is "<song time> <up> <down> <trigger>" with 0/1
+    flags; the state holds until the next line. Blank lines and lines starting
+    with # are ignored.
+    """
+    def __init__(self, path):
+        self.events = []
+        with open(path, "r") as file:
+            for line in file:
+                parts = line.split()
+                if not parts or parts[0].startswith("#"):
+                    continue
+                if len(parts) != 4:
+                    raise ValueError(f"Invalid input line: {line.strip()}. Expected 4 parts.")
+                self.events.append((float(parts[0]), tuple(part == "1" for part in parts[1:])))
+        self.events.sort(key=lambda event: event[0])
+        self.reset()
+
+    def reset(self):
+        self.cursor = 0
+        self.state = (False, False, False)
+
+    def __call__(self, level, song_time):
+        while self.cursor < len(self.events) and self.events[self.cursor][0] <= song_time:
+            self.state = self.events[self.cursor][1]
+            self.cursor += 1
+        return self.state
+
+
+def make_input(name):
+    if name == "autoplay":
+        return AutoplayInput()
+    if name == "idle":
+        return IdleInput()
+    return ScriptedInput(name)
+
+
+def load_level(level_id, setting, screen, clock):
+    """ Build the level registered under level_id (see levels/manifest.json) """
+    level_class = levels.level_class(level_id)
+    if level_class is None:
+        raise ValueError(f"Unknown level: {level_id}. Expected one of {', '.join(levels)}.")
+    return level_class(setting, screen, clock)
+
+
+def run_song(level, input_source, dt=1 / 120, draw=True, max_time=None):
+    """
+    Play one full song of a level with a simulated clock.
+
+    The level's clock and input are replaced for the run, so nothing depends
+    on the wall clock, the keyboard or the display. The song ends with the
+    level's own game over condition, or at max_time seconds of song time.
+
+    Returns:
+        dict: Final tallies of the run and how long it took in real time.
+    """
+    clock = SimulatedClock(dt)
+    level.time_source = clock
+    level.read_input = lambda: input_source(level, clock.time - level.start_time - level.total_pause_time)
+    if hasattr(input_source, "reset"):
+        input_source.reset()
+
+    wall_start = time.perf_counter()
+    level.on_enter()
+    frames = 0
+    while not level.song_finished() and (max_time is None or clock.time < max_time):
+        clock.advance()
+        level.update()
+        if draw:
+            level.draw()
+        frames += 1
+    level.on_out()
+
+    return {
+        "score": level.score,
+        "max_score": level.max_score,
+        "perfect": level.perfect,
+        "misses": level.misses,
+        "stars": [level.first_star_check, level.second_star_check, level.third_star_check],
+        "frames": frames,
+        "song_time": round(clock.time, 3),
+        "wall_time": round(time.perf_counter() - wall_start, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a level without a display at a fixed time step.")
+    parser.add_argument("--level", default="level_1", choices=list(levels), help="Level id from levels/manifest.json")
+    parser.add_argument("--input", default="autoplay", help="'autoplay', 'idle' or the path of an input script")
+    parser.add_argument("--dt", type=float, default=1 / 120, help="Simulated frame time in seconds")
+    parser.add_argument("--runs", type=int, default=1, help="Number of songs to play back to back")
+    parser.add_argument("--max-time", type=float, default=None, help="Stop each run after this much song time")
+    parser.add_argument("--no-draw", action="store_true", help="Skip rendering, only simulate")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    setting = SettingsManager()
+    screen = pygame.display.set_mode((setting.screen_width, setting.screen_height))
+    level = load_level(args.level, setting, screen, pygame.time.Clock())
+    input_source = make_input(args.input)
+
+    for _ in range(args.runs):
+        print(json.dumps(run_song(level, input_source, args.dt, not args.no_draw, args.max_time)))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+import pygame
+
+
+def surface_bytes(obj, depth=2):
+    """
+    Pixel bytes of the surfaces an object holds, for memory estimates.
+
+    Looks through attributes, lists, tuples and dicts down to depth levels of
+    objects. Surfaces shared with other holders (frame_cache, gradient_cache)
+    are counted too, so the result is an upper bound of what dropping the
+    object releases.
+    """
+    seen = set()
+
+    def walk(value, depth):
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        if isinstance(value, pygame.Surface):
+            return value.get_width() * value.get_height() * value.get_bytesize()
+        if isinstance(value, (list, tuple)):
+            return sum(walk(item, depth) for item in value)
+        if isinstance(value, dict):
+            return sum(walk(item, depth) for item in value.values())
+        if depth > 0 and hasattr(value, "__dict__") and not isinstance(value, type):
+            return sum(walk(item, depth - 1) for item in vars(value).values())
+        return 0
+
+    return walk(obj, depth)
+
+
+class LevelPool:
+    """
+    Loaded level instances kept for replays, keyed by level id.
+
+    A pooled level already holds its sprites, background and music paths, so
+    entering it again only needs its on_enter() soft reset instead of a new
+    load. The pool keeps at most max_levels instances and max_bytes of
+    estimated surface memory; past either bound the least recently played
+    levels are dropped, but never the one just stored.
+    """
+    def __init__(self, max_levels=3, max_bytes=192 * 1024 * 1024):
+        self.max_levels = max_levels
+        self.max_bytes = max_bytes
+        self.levels = OrderedDict()  # level id -> (level, estimated bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, level_id):
+        """ Return the pooled level for level_id, or None """
+        entry = self.levels.get(level_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.levels.move_to_end(level_id)
+        return entry[0]
+
+    def put(self, level_id, level):
+        """ Keep a loaded level and drop old ones over the bounds """
+        if level_id in self.levels:
+            self.bytes -= self.levels.pop(level_id)[1]
+        nbytes = surface_bytes(level)
+        self.levels[level_id] = (level, nbytes)
+        self.bytes += nbytes
+        while len(self.levels) > 1 and (len(self.levels) > self.max_levels or self.bytes > self.max_bytes):
+            _, evicted = self.levels.popitem(last=False)
+            self.bytes -= evicted[1]
+
+    def clear(self):
+        """ Drop every level, e.g. after a resolution change made them stale """
+        self.levels.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "levels": list(self.levels),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,64 @@
+import pygame
+
+
+class OverlayCache:
+    """
+    Translucent full-screen tints without per-frame surfaces.
+
+    fill() tints a target as if a solid overlay of the given color and alpha
+    had been blitted over it. On opaque targets this is done with two blended
+    fills, dst * (255 - alpha) / 255 followed by adding color * alpha / 255,
+    so no overlay surface exists at all. Targets with per-pixel alpha get a
+    pre-allocated overlay per (color, size) whose surface alpha is the only
+    thing that changes between frames. invalidate() drops those overlays,
+    e.g. after a resolution change.
+    """
+    def __init__(self):
+        self.overlays = {}  # (color, size) -> surface
+
+    def surface(self, color, size):
+        key = (tuple(color), tuple(size))
+        overlay = self.overlays.get(key)
+        if overlay is None:
+            overlay = self.overlays[key] = pygame.Surface(size)
+            overlay.fill(color)
+        return overlay
+
+    def fill(self, target, color, alpha, rect=None):
+        """
+        Tint target with color at the given alpha (0-255).
+
+        Args:
+            target (pygame.Surface): The surface to tint.
+            color: Any color pygame accepts.
+            alpha (float): Opacity of the tint, values outside 0-255 are clamped.
+            rect: Area to tint, the whole target by default.
+        """
+        alpha = min(255, int(alpha))
+        if alpha <= 0:
+            return
+        color = pygame.Color(color)
+        area = target.get_rect() if rect is None else pygame.Rect(rect)
+        if target.get_flags() & pygame.SRCALPHA:
+            overlay = self.surface(color, area.size)
+            overlay.set_alpha(alpha)
+            target.blit(overlay, area)
+            return
+        target.fill((255 - alpha, 255 - alpha, 255 - alpha), area, special_flags=pygame.BLEND_MULT)
+        if color.r or color.g or color.b:
+            target.fill((color.r * alpha // 255, color.g * alpha // 255, color.b * alpha // 255), area, special_flags=pygame.BLEND_ADD)
+
+    def blit_texture(self, target, texture, alpha, dest=(0, 0)):
+        """ Blit a pre-built texture at the given alpha, changing the texture's own alpha instead of copying it """
+        alpha = min(255, int(alpha))
+        if alpha <= 0:
+            return
+        texture.set_alpha(alpha)
+        target.blit(texture, dest)
+
+    def invalidate(self):
+        self.overlays.clear()
+
+
+# Shared by the scene manager transitions and the weather effects
+overlays = OverlayCache()
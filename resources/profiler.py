@@ -0,0 +1,140 @@
+import os, csv, time
+import numpy as np
+import pygame
+
+
+class RingBuffer:
+    """Fixed-size buffer of the most recent samples of one timing scope."""
+    def __init__(self, size=600):
+        self.samples = np.zeros(size, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+        self.total_count = 0
+
+    def push(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+        self.total_count += 1
+
+    def stats(self):
+        """ Mean, p50, p95, p99 and max of the buffered samples, in milliseconds """
+        window = self.samples[:self.count] * 1000
+        p50, p95, p99 = np.percentile(window, (50, 95, 99))
+        return {"mean": float(window.mean()), "p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(window.max())}
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class Profiler:
+    """
+    Named timing scopes with rolling histograms.
+
+        with profiler.scope("judgement"):
+            ...
+
+    Each scope keeps its last buffer_size durations in a ring buffer. While
+    disabled, scope() hands back one shared no-op context manager, so the
+    instrumentation left in hot paths costs a method call and nothing else.
+    Set HH_PROFILE=1 to record from startup; F3 toggles the overlay and
+    records while it is shown.
+    """
+    def __init__(self, buffer_size=600, enabled=False):
+        self.buffer_size = buffer_size
+        self.always_on = enabled
+        self.enabled = enabled
+        self.overlay = False
+        self.buffers = {}
+        self.scopes = {}
+        self.font = None
+        self.overlay_surface = None
+        self.overlay_refresh = 0.25  # Seconds between overlay redraws
+        self.last_overlay_time = 0
+
+    def scope(self, name):
+        if not self.enabled:
+            return _NULL_SCOPE
+        scope = self.scopes.get(name)
+        if scope is None:
+            scope = self.scopes[name] = _Scope(self, name)
+        return scope
+
+    def record(self, name, duration):
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            buffer = self.buffers[name] = RingBuffer(self.buffer_size)
+        buffer.push(duration)
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.enabled = self.overlay or self.always_on
+        self.overlay_surface = None
+
+    def report(self):
+        """ Rows of (scope name, samples recorded, stats) sorted by name """
+        return [(name, buffer.total_count, buffer.stats()) for name, buffer in sorted(self.buffers.items())]
+
+    def draw_overlay(self, surface):
+        """ Draw the per-scope timings in the top-left corner when the overlay is on """
+        if not self.overlay:
+            return
+        now = time.perf_counter()
+        if self.overlay_surface is None or now - self.last_overlay_time >= self.overlay_refresh:
+            self.overlay_surface = self.render_overlay()
+            self.last_overlay_time = now
+        surface.blit(self.overlay_surface, (10, 10))
+
+    def render_overlay(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 22)
+        lines = [f"{'scope':20} {'mean':>7} {'p95':>7} {'max':>7}  ms"]
+        for name, _, stats in self.report():
+            lines.append(f"{name:20} {stats['mean']:7.2f} {stats['p95']:7.2f} {stats['max']:7.2f}")
+        line_height = self.font.get_linesize()
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(text.get_width() for text in rendered) + 16
+        panel = pygame.Surface((width, line_height * len(rendered) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for row, text in enumerate(rendered):
+            panel.blit(text, (8, 6 + row * line_height))
+        return panel
+
+    def dump_csv(self, path="profile.csv"):
+        """ Write the stats of every scope to a CSV file, nothing is written if nothing was recorded """
+        if not self.buffers:
+            return None
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["scope", "samples", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+            for name, total_count, stats in self.report():
+                writer.writerow([name, total_count] + [round(stats[key], 4) for key in ("mean", "p50", "p95", "p99", "max")])
+        return path
+
+
+# Shared by the scene manager and the scenes
+profiler = Profiler(enabled=os.environ.get("HH_PROFILE", "") not in ("", "0"))
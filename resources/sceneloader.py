@@ -0,0 +1,79 @@
+import time
+import types
+from concurrent.futures import Future
+
+
+def run_steps(steps):
+    """ Run a loading generator to the end in one go and return its result """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+class SceneLoader:
+    """
+    Builds a scene a little every frame.
+
+    A loader is a generator that yields between loading phases and returns
+    the finished scene (see GameplayLevel.loader); a plain callable is
+    accepted too and is built in one go. step() resumes the generator until
+    the per-frame time budget is spent, so the frames around a scene change
+    keep their rhythm while the next scene decodes its assets.
+
+    A loader may also yield a Future, e.g. a sheet from
+    prefetch_spritesheets: the loader is then not resumed until the future
+    is done, and the frames in between are left alone.
+    """
+    def __init__(self, budget=0.004):
+        self.budget = budget  # Seconds of loading per frame
+        self.name = None
+        self.steps = None
+        self.scene = None
+        self.waiting = None  # Future the loader is waiting on
+
+    @property
+    def loading(self):
+        return self.steps is not None
+
+    def start(self, name, loader):
+        self.name = name
+        self.scene = None
+        self.waiting = None
+        if isinstance(loader, types.GeneratorType):
+            self.steps = loader
+        else:
+            self.steps = None
+            self.scene = loader()
+
+    def step(self, budget=None):
+        """
+        Run loading phases until the budget is spent.
+
+        Returns:
+            bool: True once the scene is built.
+        """
+        if self.steps is None:
+            return True
+        deadline = time.perf_counter() + (self.budget if budget is None else budget)
+        while True:
+            if self.waiting is not None:
+                if not self.waiting.done() and budget != float("inf"):
+                    return False
+                self.waiting = None
+            try:
+                phase = next(self.steps)
+            except StopIteration as done:
+                self.scene = done.value
+                self.steps = None
+                return True
+            if isinstance(phase, Future):
+                self.waiting = phase
+            if time.perf_counter() >= deadline:
+                return False
+
+    def finish(self):
+        """ Build whatever is left without a budget """
+        self.step(float("inf"))
+        return self.scene
@@ -0,0 +1,180 @@
+import os, sys, time, argparse, builtins
+
+
+class _Span:
+    __slots__ = ("profiler", "category", "name", "start")
+
+    def __init__(self, profiler, category, name):
+        self.profiler = profiler
+        self.category = category
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.profiler.depth += 1
+
+    def __exit__(self, *exc):
+        self.profiler.depth -= 1
+        self.profiler.spans.append((self.category, self.name, self.start, time.perf_counter(), self.profiler.depth))
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class StartupProfiler:
+    """
+    Waterfall of everything between launch and the first presented frame.
+
+        with startup.span("scene", "title"):
+            ...
+
+    Spans are recorded with their start, end and nesting depth: module
+    imports (through an __import__ hook, first imports only), scene
+    construction and asset loading. first_frame() closes the recording and
+    prints the waterfall. Set HH_STARTUP_PROFILE=1 to record a normal
+    launch; while disabled span() hands back one shared no-op context
+    manager and no import hook is installed.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.spans = []  # (category, name, start, end, depth)
+        self.depth = 0
+        self.first_frame_time = None
+        self.exit_after_first_frame = False
+        self.original_import = None
+        if enabled:
+            self.enable()
+
+    def enable(self):
+        self.enabled = True
+        if self.original_import is None:
+            self.original_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def disable(self):
+        self.enabled = False
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only absolute imports of modules not loaded yet cost anything worth showing
+        if level or name in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+        with self.span("import", name):
+            return self.original_import(name, globals, locals, fromlist, level)
+
+    def span(self, category, name):
+        if not self.enabled or self.first_frame_time is not None:
+            return _NULL_SPAN
+        return _Span(self, category, name)
+
+    def first_frame(self):
+        """
+        Mark the first frame as presented.
+
+        Returns:
+            bool: True when the game loop should stop, see exit_after_first_frame.
+        """
+        if self.first_frame_time is None:
+            self.first_frame_time = time.perf_counter()
+            if self.enabled:
+                self.disable()
+                print(self.waterfall())
+        return self.exit_after_first_frame
+
+    @property
+    def time_to_first_frame(self):
+        """ Seconds from the start of recording to the first frame, None before it """
+        if self.first_frame_time is None:
+            return None
+        return self.first_frame_time - self.origin
+
+    def waterfall(self, width=40, min_duration=0.001, max_depth=3):
+        """
+        The recorded spans as text bars on a common time axis.
+
+        Spans shorter than min_duration seconds or nested deeper than
+        max_depth are left out to keep the chart readable.
+        """
+        end = self.first_frame_time or time.perf_counter()
+        total = max(end - self.origin, 1e-9)
+        lines = [f"{'start':>8} {'ms':>8}  {'span':44} timeline ({total * 1000:.1f} ms to first frame)"]
+        for category, name, start, stop, depth in sorted(self.spans, key=lambda span: (span[2], span[4])):
+            if stop - start < min_duration or depth > max_depth:
+                continue
+            first = int((start - self.origin) / total * width)
+            length = max(1, int((stop - start) / total * width))
+            label = ("  " * depth + f"{category} {name}")[:44]
+            lines.append(f"{(start - self.origin) * 1000:8.1f} {(stop - start) * 1000:8.1f}  {label:44} |{' ' * first}{'#' * length}")
+        return "\n".join(lines)
+
+    def totals(self):
+        """
+        Seconds spent per category.
+
+        Time of a nested span is taken off its parent, so e.g. gradients
+        built while a scene is constructed count as gradient time only and
+        the totals add up to the time covered by top-level spans.
+        """
+        totals = {}
+        parents = []  # Category of the latest span at each depth
+        for category, _, start, stop, depth in sorted(self.spans, key=lambda span: (span[2], span[4])):
+            totals[category] = totals.get(category, 0) + stop - start
+            if depth > 0:
+                totals[parents[depth - 1]] -= stop - start
+            del parents[depth:]
+            parents.append(category)
+        return totals
+
+
+# Shared by the entry point, the scene manager and the asset loaders
+startup = StartupProfiler(enabled=os.environ.get("HH_STARTUP_PROFILE", "") not in ("", "0"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Launch the game headless, print the startup waterfall and check time to first frame.")
+    parser.add_argument("--budget", type=float, default=2000, help="Allowed time to first frame in milliseconds")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.append(parent_dir)
+
+    # The game records into resources.startup, not into this script's own copy of the module
+    from resources.startup import startup as recorder
+    recorder.origin = time.perf_counter()
+    recorder.enable()
+    recorder.exit_after_first_frame = True
+    import main_without_detection
+    try:
+        main_without_detection.main()
+    except SystemExit:
+        pass
+
+    elapsed = recorder.time_to_first_frame
+    if elapsed is None:
+        print("The game exited before presenting a frame")
+        return 1
+    print("Totals: " + ", ".join(f"{category} {seconds * 1000:.1f} ms" for category, seconds in sorted(recorder.totals().items())))
+    if elapsed * 1000 > args.budget:
+        print(f"Time to first frame {elapsed * 1000:.1f} ms is over the {args.budget:.0f} ms budget")
+        return 1
+    print(f"Time to first frame {elapsed * 1000:.1f} ms, within the {args.budget:.0f} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import hashlib, os, struct, sys
+import pygame
+
+# Cached surface layout:
+#   header: magic, format version, reserved, width, height
+#   pixels: width * height BGRA pixels, rows top to bottom without padding
+SURFACE_MAGIC = b"HHSF"
+SURFACE_VERSION = 1
+SURFACE_EXTENSION = ".surface"
+HEADER = struct.Struct("<4sHHII")
+PIXEL_FORMAT = "BGRA"
+# Channel masks of a surface whose pixels already sit in memory as BGRA
+BGRA_MASKS = (0xff0000, 0xff00, 0xff, 0xff000000) if sys.byteorder == "little" else (0xff00, 0xff0000, 0xff000000, 0xff)
+
+# Bump when a generator whose surfaces are cached changes what it draws
+GENERATOR_VERSION = 1
+
+
+class SurfaceDiskCache:
+    """
+    Procedural surfaces kept on disk between launches.
+
+    A surface is stored as its raw pixels under a name hashed from its
+    generator key (which holds the generator parameters and the size, so
+    the resolution is part of it) and the format and generator versions.
+    Loading is one read of the file into a buffer and
+    pygame.image.frombuffer() over the pixels, which the surface then
+    shares. Surfaces under min_bytes are not worth a file and are never
+    stored. Files that cannot be read or written are ignored, the caller
+    then builds the surface as usual.
+
+    The directory holds at most max_bytes of files. Loading a file touches
+    its mtime, and past the bound the files used least recently are deleted
+    first.
+    """
+    def __init__(self, directory, min_bytes=64 * 1024, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.bytes = None  # Size of the files, counted on the first store
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key):
+        digest = hashlib.sha1(repr((SURFACE_VERSION, GENERATOR_VERSION, key)).encode()).hexdigest()
+        return os.path.join(self.directory, digest + SURFACE_EXTENSION)
+
+    def load(self, key):
+        """ The cached surface for key, or None """
+        path = self.path_for(key)
+        try:
+            with open(path, "rb", buffering=0) as file:
+                data = bytearray(os.fstat(file.fileno()).st_size)
+                size = file.readinto(data)
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            magic, version, _, width, height = HEADER.unpack_from(data, 0)
+        except struct.error:
+            magic = None
+        if magic != SURFACE_MAGIC or version != SURFACE_VERSION or size != len(data) or size != HEADER.size + width * height * 4:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pygame.image.frombuffer(memoryview(data)[HEADER.size:], (width, height), PIXEL_FORMAT)
+
+    def store(self, key, surface):
+        """ Write surface for key, replacing any older file atomically """
+        width, height = surface.get_size()
+        nbytes = width * height * 4
+        if nbytes < self.min_bytes:
+            return
+        path = self.path_for(key)
+        temp_path = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.bytes is None:
+                self.bytes = sum(entry.stat().st_size for entry in self._entries())
+            with open(temp_path, "wb") as file:
+                file.write(HEADER.pack(SURFACE_MAGIC, SURFACE_VERSION, 0, width, height))
+                if surface.get_bytesize() == 4 and surface.get_pitch() == width * 4 and surface.get_masks() == BGRA_MASKS:
+                    # Already BGRA without row padding, write the pixels as they are
+                    file.write(surface.get_buffer())
+                else:
+                    file.write(pygame.image.tobytes(surface, PIXEL_FORMAT))
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        self.bytes += HEADER.size + nbytes
+        if self.bytes > self.max_bytes:
+            self.prune()
+
+    def prune(self):
+        """ Delete the least recently used files until the directory fits in max_bytes """
+        try:
+            entries = sorted(((entry.stat(), entry.path) for entry in self._entries()), key=lambda entry: entry[0].st_mtime)
+        except OSError:
+            return
+        self.bytes = sum(stat.st_size for stat, _ in entries)
+        for stat, path in entries:
+            if self.bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.bytes -= stat.st_size
+
+    def clear(self):
+        """ Delete every cached surface file """
+        for entry in self._entries():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        self.bytes = 0
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith(SURFACE_EXTENSION)]
+
+
+def user_cache_dir():
+    """ The per-user cache directory of the game for this platform """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        return os.path.join(base, "Harmonic Horizons", "Cache")
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~"), "Library", "Caches", "Harmonic Horizons")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "harmonic-horizons")
+
+
+def default_disk_cache():
+    """
+    The cache under surfaces/ in the user's cache directory.
+
+    HH_SURFACE_CACHE overrides the directory, or turns the cache off with 0.
+    """
+    directory = os.environ.get("HH_SURFACE_CACHE") or os.path.join(user_cache_dir(), "surfaces")
+    if directory == "0":
+        return None
+    return SurfaceDiskCache(directory)
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+import pygame
+
+
+class TextCache:
+    """
+    Rendered text shared by every scene, with least-recently-used eviction.
+
+    render() returns the surface Font.render would, keyed by (font, text,
+    color, antialias); a Font object stands for its face and size. Cached
+    surfaces are shared, so callers blit them and never draw on them.
+
+    draw_glyphs() is meant for strings that change every few frames, like
+    the streak counter: it blits the string one cached glyph at a time, so a
+    new value costs a few blits instead of a call to the rasterizer and
+    nothing new is kept in the cache.
+    """
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.glyphs = {}  # (font, character, color, antialias) -> surface
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            return surface
+        surface = self.entries[key] = font.render(text, antialias, color)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def glyph(self, font, character, color, antialias=True):
+        key = (font, character, color, antialias)
+        surface = self.glyphs.get(key)
+        if surface is None:
+            surface = self.glyphs[key] = font.render(character, antialias, color)
+        return surface
+
+    def draw_glyphs(self, surface, font, text, color, position, antialias=True):
+        """
+        Blit text composed from cached glyphs with its top-left corner at position.
+
+        Returns:
+            pygame.Rect: The area drawn.
+        """
+        x, y = position
+        start_x = x
+        height = 0
+        for character in text:
+            glyph = self.glyph(font, character, color, antialias)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+            height = max(height, glyph.get_height())
+        return pygame.Rect(start_x, y, x - start_x, height)
+
+    def clear(self):
+        self.entries.clear()
+        self.glyphs.clear()
+
+
+# Shared by the scenes and the widgets in resources.UIElements
+text_cache = TextCache()
@@ -1,5 +1,10 @@
-import pygame, json
+import pygame, json, os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from resources.overlays import overlays
+from resources.startup import startup
+from resources.sceneloader import run_steps
 
 def update_score(level, score, missed, perfect, is_first_star, is_second_star, is_third_star, filename="level_score.json"):
     # Default structure for the JSON file
@@ -59,32 +64,156 @@ def update_score(level, score, missed, perfect, is_first_star, is_second_star, i
     with open(filename, "w") as file:
         json.dump(data, file, indent=4)
 
-def load_frames_from_spritesheet(image_path, columns, rows):
+class FrameCache:
+    """
+    Process-wide cache of frames sliced from spritesheets.
+
+    Entries are keyed by (path, columns, rows, alpha mode) and hold immutable
+    tuples of frames, so every level, UI screen and sprite that asks for the
+    same sheet shares one set of surfaces. The least recently used entries are
+    evicted once the cached pixel bytes go over ``max_bytes``.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (frames, frame_width, frame_height, nbytes)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(image_path, columns, rows, alpha=None):
+        return (os.path.abspath(image_path), columns, rows, alpha)
+
+    def get(self, key):
+        """Return the cached (frames, frame_width, frame_height) for key, or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[:3]
+
+    def put(self, key, frames, frame_width, frame_height):
+        """Store frames under key and evict old entries over the byte budget."""
+        frames = tuple(frames)
+        nbytes = sum(frame.get_bytesize() * frame.get_width() * frame.get_height() for frame in frames)
+        if key in self.entries:
+            self.current_bytes -= self.entries.pop(key)[3]
+        self.entries[key] = (frames, frame_width, frame_height, nbytes)
+        self.current_bytes += nbytes
+        # Never evict the entry that was just added, even if it is over budget on its own
+        while self.current_bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.current_bytes -= evicted[3]
+        return frames, frame_width, frame_height
+
+    def has_sheet(self, image_path):
+        """Whether any slicing of the sheet at image_path is cached."""
+        image_path = os.path.abspath(image_path)
+        return any(key[0] == image_path for key in self.entries)
+
+    def purge(self):
+        """Drop every cached sheet and return the number of pixel bytes released."""
+        released = self.current_bytes
+        self.entries.clear()
+        self.current_bytes = 0
+        return released
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+frame_cache = FrameCache()
+
+# Sheets being decoded off the main thread, see prefetch_spritesheets
+_decoder = None
+_decoding = {}  # absolute image path -> Future of the decoded, unconverted sheet
+
+
+def prefetch_spritesheets(*image_paths):
+    """
+    Start decoding spritesheets on a worker thread.
+
+    pygame releases the GIL while it decodes an image file, so a level can
+    queue its sheets and keep the frame loop running. Only the decode runs
+    on the worker; converting to the display format and slicing frames stay
+    on the main thread in load_frames_from_spritesheet, which picks up the
+    decoded sheet (waiting for it if needed). Sheets already in frame_cache
+    are skipped.
+
+    Returns:
+        list: The futures of the sheets being decoded.
+    """
+    global _decoder
+    if _decoder is None:
+        _decoder = ThreadPoolExecutor(max_workers=2, thread_name_prefix="spritesheet")
+    futures = []
+    for image_path in image_paths:
+        image_path = os.path.abspath(image_path)
+        if frame_cache.has_sheet(image_path):
+            continue
+        future = _decoding.get(image_path)
+        if future is None:
+            future = _decoding[image_path] = _decoder.submit(pygame.image.load, image_path)
+        futures.append(future)
+    return futures
+
+
+def load_frames_from_spritesheet(image_path, columns, rows, alpha=None):
     """
     Extract frames from a spritesheet and return frame dimensions.
 
+    Sheets are decoded once per process and served from ``frame_cache``
+    afterwards, so callers must treat the returned frames as read-only.
+
     Args:
         image_path (str): Path to the spritesheet image.
         columns (int): Number of columns in the spritesheet.
         rows (int): Number of rows in the spritesheet.
+        alpha (bool | None): Force convert_alpha() (True) or convert() (False).
+            None keeps the sheet's own transparency.
 
     Returns:
         tuple: (frames, frame_width, frame_height)
-            - frames (list): A list of Pygame surfaces, each representing a frame.
+            - frames (tuple): Pygame surfaces, each representing a frame.
             - frame_width (int): Width of a single frame.
             - frame_height (int): Height of a single frame.
     """
+    return run_steps(iter_spritesheet(image_path, columns, rows, alpha))
+
+
+def iter_spritesheet(image_path, columns, rows, alpha=None):
+    """
+    load_frames_from_spritesheet as a generator for scene loaders.
+
+    Each frame is converted to the display format and sliced on its own,
+    with a yield after every frame, so no single step handles the whole
+    sheet. Returns what load_frames_from_spritesheet does.
+    """
+    key = FrameCache.make_key(image_path, columns, rows, alpha)
+    decoding = _decoding.pop(key[0], None)
+    cached = frame_cache.get(key)
+    if cached is not None:
+        return cached
+
     # Ensure Pygame is initialized
-    pygame.init()
+    if not pygame.get_init():
+        pygame.init()
 
-    # Load the spritesheet image
-    spritesheet = pygame.image.load(image_path)
+    with startup.span("asset", os.path.basename(image_path)):
+        # Load the spritesheet image, or take it from the worker if it was prefetched
+        spritesheet = decoding.result() if decoding is not None else pygame.image.load(image_path)
+    yield
 
     # If the image has transparency, use convert_alpha() to keep it
-    if spritesheet.get_flags() & pygame.SRCALPHA:
-        spritesheet = spritesheet.convert_alpha()
-    else:
-        spritesheet = spritesheet.convert()
+    use_alpha = bool(spritesheet.get_flags() & pygame.SRCALPHA) if alpha is None else alpha
 
     # Get the size of each frame
     sheet_width, sheet_height = spritesheet.get_size()
@@ -97,11 +226,14 @@ def load_frames_from_spritesheet(image_path, columns, rows):
         for col in range(columns):
             x = col * frame_width
             y = row * frame_height
+            region = spritesheet.subsurface((x, y, frame_width, frame_height))
+            region = region.convert_alpha() if use_alpha else region.convert()
             frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
-            frame.blit(spritesheet, (0, 0), (x, y, frame_width, frame_height))
+            frame.blit(region, (0, 0))
             frames.append(frame)
+            yield
 
-    return frames, frame_width, frame_height
+    return frame_cache.put(key, frames, frame_width, frame_height)
 
 
 class BackgroundArtifacts(pygame.sprite.Sprite):
@@ -125,8 +257,13 @@ class BackgroundArtifacts(pygame.sprite.Sprite):
             self.scroll = 0
 
 class EffectManager:
-    def __init__(self, surface, lightning_surface=None):
-        self.surface = surface
+    """
+    Dimming and lightning flashes over a scene.
+
+    update() fades the active effects, draw() tints the frame being composed
+    with them through the shared overlay cache.
+    """
+    def __init__(self, lightning_surface=None):
         self.lightning_surface = lightning_surface
         self.dimming_alpha = 0
         self.lightning_alpha = 0
@@ -140,36 +277,28 @@ class EffectManager:
         self.is_dimming_active = True
         self.dimming_alpha = min(255, intensity)
 
-    def apply_dimming(self, dt):
-        if self.dimming_alpha > 0:
-            # Create and apply a dimming overlay
-            overlay = pygame.Surface(self.surface.get_size())
-            overlay.fill((0, 0, 0))  # Black color for dimming
-            overlay.set_alpha(int(self.dimming_alpha))
-            self.surface.blit(overlay, (0, 0))
+    def trigger_lightning(self, intensity=180):
+        self.is_lightning_active = True
+        self.lightning_alpha = intensity
 
-            # Gradually fade out the dimming effect
+    def update(self, dt):
+        # Gradually fade out the dimming effect
+        if self.is_dimming_active:
             self.dimming_alpha = max(0, self.dimming_alpha - self.dimming_decay_rate * dt)
             if self.dimming_alpha == 0:
                 self.is_dimming_active = False
 
-    def trigger_lightning(self, intensity=180):
-        self.is_lightning_active = True
-        self.lightning_alpha = intensity
+        # Gradually fade the lightning effect
+        if self.is_lightning_active:
+            self.lightning_alpha = max(0, self.lightning_alpha - self.lightning_decay_rate * dt)
+            if self.lightning_alpha == 0:
+                self.is_lightning_active = False
 
-    def apply_lightning(self, dt):
+    def draw(self, surface):
+        if self.dimming_alpha > 0:
+            overlays.fill(surface, (0, 0, 0), self.dimming_alpha)
         if self.lightning_alpha > 0:
             if self.lightning_surface:
-                lightning_effect = self.lightning_surface.copy()
-                lightning_effect.set_alpha(int(self.lightning_alpha))
-                self.surface.blit(lightning_effect, (0, 0))
+                overlays.blit_texture(surface, self.lightning_surface, self.lightning_alpha)
             else:
-                flash = pygame.Surface(self.surface.get_size())
-                flash.fill((255, 255, 255))
-                flash.set_alpha(int(self.lightning_alpha))
-                self.surface.blit(flash, (0, 0))
-
-            # Gradually fade the lightning effect
-            self.lightning_alpha = max(0, self.lightning_alpha - self.lightning_decay_rate * dt)
-            if self.lightning_alpha == 0:
-                self.is_lightning_active = False
\ No newline at end of file
+                overlays.fill(surface, (255, 255, 255), self.lightning_alpha)
\ No newline at end of file